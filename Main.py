@@ -1,66 +1,56 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import altair as alt
-import matplotlib.pyplot as plt
 
-
-st.set_page_config(page_title="Main", page_icon="🚀", layout="wide")
+import ingest
+import latency
+import time_saved
+import usage_data
+from dashboard_utils import (
+    as_of_control,
+    cached_figure,
+    download_buttons,
+    load_dataset,
+    load_latency_sketch,
+    load_org_bounds,
+    load_org_event_counts,
+    load_roi_ledger,
+    load_slow_request_index,
+    load_trial_cohorts,
+    load_user_activity,
+    load_user_directory,
+    pivot_body,
+    pivot_with_totals,
+    user_directory_version,
+)
 
 
-# Load dataset
-df_all = pd.read_csv("df_all.csv")
+st.set_page_config(page_title="Main", page_icon="🚀", layout="wide")
 
-# Convert created_at and trial_start_date to datetime
-df_all['created_at'] = pd.to_datetime(df_all['created_at'])
-df_all['trial_start_date'] = pd.to_datetime(df_all['trial_start_date'])
 
-# 기준 날짜: 오늘 날짜 정오 기준
-now = pd.Timestamp.now().normalize() + pd.Timedelta(hours=12)
+# 기준 날짜 (as_of): 주차 범위, "오늘 제외" 필터, 캐시 키 모두 이 값 기준
+as_of = as_of_control()
+now = pd.Timestamp(as_of).normalize() + pd.Timedelta(hours=12)
 
 # 각 주차 범위 설정
-week_ranges = {
-    'week4': (now - pd.Timedelta(days=6), now),
-    'week3': (now - pd.Timedelta(days=13), now - pd.Timedelta(days=7)),
-    'week2': (now - pd.Timedelta(days=20), now - pd.Timedelta(days=14)),
-    'week1': (now - pd.Timedelta(days=27), now - pd.Timedelta(days=21)),
-}
-
-# 주차 버킷 할당 함수
-def assign_week_bucket(date):
-    if pd.isna(date):
-        return None
-    for week, (start, end) in week_ranges.items():
-        if start <= date <= end:
-            return week
-    return None
-
-# 전처리
-df_all['week_bucket'] = df_all['created_at'].apply(assign_week_bucket)
-df_all['day_bucket'] = df_all['created_at'].dt.date
-df_all['agent_type'] = df_all['function_mode'].str.split(":").str[0]
-
-# 절감 시간 매핑
-time_map = {"deep_research": 40, "pulse_check": 30}
-df_all["saved_minutes"] = df_all["agent_type"].map(time_map).fillna(30)
-
-# UI 설정
+week_ranges = usage_data.build_week_ranges(as_of)
+
+# UI 설정 (데이터 로딩 전에 먼저 표시)
 st.title("\U0001F680 Usage Summary Dashboard")
 
+# Load dataset (as_of 시점 스냅샷, 주차 버킷 포함)
+version = usage_data.data_version()
+with st.spinner("Loading data..."):
+    df_all = load_dataset(as_of, version)
+
 # 조직 리스트 추출
-org_event_counts = (
-    df_all[df_all['status'] == 'active']
-    .groupby('organization')
-    .size()
-    .sort_values(ascending=False)
-)
+org_event_counts = load_org_event_counts(as_of, version)
 org_list_sorted = org_event_counts.index.tolist()
 
 # 조직 선택
 selected_org = st.selectbox("Select Organization", org_list_sorted)
 
-# 데이터 필터링
-df_org = df_all[df_all['organization'] == selected_org]
+# 데이터 필터링 (정렬된 조직 구간 슬라이스)
+df_org = usage_data.org_slice(df_all, selected_org, load_org_bounds(as_of, version))
 df_active = df_org[df_org['status'] == 'active']
 
 # 임시로 organization의 첫 이벤트 날짜를 trial_start_date로 사용
@@ -68,14 +58,12 @@ if 'trial_start_date' not in df_org.columns or df_org['trial_start_date'].isna()
     if not df_org.empty and not df_org['created_at'].isna().all():
         trial_start_date = df_org['created_at'].min()
     else:
-        trial_start_date = pd.Timestamp.now()  # 데이터가 없는 경우 현재 날짜 사용
-    df_org['trial_start_date'] = trial_start_date
+        trial_start_date = pd.Timestamp(as_of)  # 데이터가 없는 경우 기준 날짜 사용
+    df_org = df_org.assign(trial_start_date=trial_start_date)
 
-# Metric 계산
+# Metric 계산 (이벤트만으로 계산되는 지표)
 total_events = df_active.shape[0]
-total_users = df_org['user_email'].nunique()
 active_users = df_active['user_email'].nunique()
-active_ratio = f"{active_users} / {total_users}"
 
 # Top user
 if not df_active['user_name'].dropna().empty:
@@ -88,34 +76,76 @@ else:
 # 평균 이벤트
 avg_events = round(total_events / active_users, 1) if active_users > 0 else 0
 
-# 절감 시간
+# Layout – Metrics
+# 이벤트 기반 지표를 먼저 그리고, 유저 디렉터리 / ROI ledger / 활동 비트셋 지표는 자리만 잡아 둔 뒤 로딩 후 채움
+col1, col2, col3 = st.columns(3)
+col1.metric("All Events", total_events)
+users_metric = col2.empty()
+col3.metric("Top User", top_user_display)
+
+col4, col5, col6 = st.columns(3)
+onboarding_metric = col4.empty()
+col5.metric("Avg. Events per Active User", avg_events)
+saved_metric = col6.empty()
+activity_row = st.empty()
+
+# 유저 디렉터리 기준: 전체 유저 수 / Earnings·Briefing 온보딩
+df_users = load_user_directory(user_directory_version())
+df_users = ingest.directory_as_of(df_users[df_users['organization'] == selected_org], as_of)
+total_users = df_users['user_email'].nunique()
+users_metric.metric("Active / Total Users", f"{active_users} / {total_users}")
+earnings_users = df_users[df_users['earnings'] == 'onboarded']['user_email'].nunique()
+briefing_users = df_users[df_users['briefing'] == 'onboarded']['user_email'].nunique()
+onboarding_metric.metric("Earnings/Briefing Users", f"{earnings_users}/{briefing_users}")
+
+# ✅ Invited & No-Usage Users 추출 (유저 디렉터리 기준)
+invited_emails = df_users[df_users['status'] == 'invited_not_joined']['user_email'].unique()
+joined_no_usage_emails = df_users[df_users['status'] == 'joined_no_usage']['user_email'].unique()
+
+invited_display = ", ".join(invited_emails) if len(invited_emails) > 0 else "—"
+joined_display = ", ".join(joined_no_usage_emails) if len(joined_no_usage_emails) > 0 else "—"
+
+# 절감 시간 (ingest 시 만든 조직 × 유저 × 주 ledger 합계, as_of까지)
+roi_ledger = time_saved.org_ledger(load_roi_ledger(version, time_saved.model_version()), selected_org, as_of)
 used_weeks = df_org["week_bucket"].dropna().nunique()
 if used_weeks >= 1 and active_users > 0:
-    total_saved_minutes = df_active["saved_minutes"].sum()
+    total_saved_minutes = roi_ledger["saved_minutes"].sum()
     saved_minutes_per_user_per_week = round(total_saved_minutes / used_weeks / active_users, 1)
     saved_display = f"{saved_minutes_per_user_per_week} min"
 else:
     saved_display = "—"
+saved_metric.metric("Avg. Time Saved / User / Week", saved_display)
+
+# DAU / WAU / MAU, Stickiness, Churn (일별 유저 비트셋 기반)
+user_activity = load_user_activity(as_of, version)
+dau = user_activity.distinct(selected_org, as_of, as_of)
+wau = user_activity.distinct(selected_org, as_of - pd.Timedelta(days=6), as_of)
+mau = user_activity.distinct(selected_org, as_of - pd.Timedelta(days=29), as_of)
+# 이력이 30일보다 짧은 조직도 MAU와 같은 30일 구간으로 평균 (활동 전 날짜는 0명)
+daily_active = user_activity.rolling_distinct(selected_org, 1, end_date=as_of).reindex(
+    pd.date_range(end=pd.Timestamp(as_of), periods=30, freq='D'), fill_value=0
+)
+stickiness = f"{daily_active.mean() / mau:.0%}" if mau > 0 else "—"
+churned_users = user_activity.churned_users(
+    selected_org,
+    previous=(as_of - pd.Timedelta(days=59), as_of - pd.Timedelta(days=30)),
+    current=(as_of - pd.Timedelta(days=29), as_of),
+)
 
-# ✅ Invited & No-Usage Users 추출
-invited_emails = df_org[df_org['status'] == 'invited_not_joined']['user_email'].dropna().unique()
-joined_no_usage_emails = df_org[df_org['status'] == 'joined_no_usage']['user_email'].dropna().unique()
-
-invited_display = ", ".join(invited_emails) if len(invited_emails) > 0 else "—"
-joined_display = ", ".join(joined_no_usage_emails) if len(joined_no_usage_emails) > 0 else "—"
-
-# Layout – Metrics
-col1, col2, col3 = st.columns(3)
-col1.metric("All Events", total_events)
-col2.metric("Active / Total Users", active_ratio)
-col3.metric("Top User", top_user_display)
+with activity_row.container():
+    col7, col8, col9 = st.columns(3)
+    col7.metric("DAU / WAU / MAU", f"{dau} / {wau} / {mau}")
+    col8.metric("Stickiness (Avg. DAU / MAU)", stickiness)
+    col9.metric(
+        "Churned Users (30d)",
+        len(churned_users),
+        help=", ".join(churned_users) if churned_users else "Active in the previous 30 days but not in the last 30 days"
+    )
 
-col4, col5, col6 = st.columns(3)
-earnings_users = df_org[df_org['earnings'] == 'onboarded']['user_email'].nunique()
-briefing_users = df_org[df_org['briefing'] == 'onboarded']['user_email'].nunique()
-col4.metric("Earnings/Briefing Users", f"{earnings_users}/{briefing_users}")
-col5.metric("Avg. Events per Active User", avg_events)
-col6.metric("Avg. Time Saved / User / Week", saved_display)
+# ⬇️ 조직 전체 이벤트 내보내기 (as_of까지의 전체 기간)
+with st.expander("⬇️ Export organization events"):
+    st.caption(f"{len(df_org):,} rows up to {as_of}")
+    download_buttons(df_org, f"{selected_org}_events_{as_of}", key="export_org_events", label="Events")
 
 # User Status 섹션
 st.markdown("### 👥 User Status")
@@ -173,14 +203,11 @@ with status_col2:
     normal_only_users.sort()
     normal_only_display = ", ".join(normal_only_users) if normal_only_users else "—"
 
-    # Recent 2 Weeks Active Users 찾기 (week3, week4)
-    recent_weeks = ['week3', 'week4']
-    users_by_week = {
-        week: set(df_org[df_org['week_bucket'] == week]['user_name'].unique())
-        for week in recent_weeks
-    }
-    consistent_users = list(set.intersection(*users_by_week.values()))
-    consistent_users.sort()
+    # Recent 2 Weeks Active Users 찾기 (week3, week4) - 일별 유저 비트셋 교집합
+    consistent_users = user_activity.consistent_users(selected_org, [
+        (as_of - pd.Timedelta(days=13), as_of - pd.Timedelta(days=7)),
+        (as_of - pd.Timedelta(days=6), as_of),
+    ])
     consistent_display = ", ".join(consistent_users) if consistent_users else "—"
 
     # 오른쪽 열
@@ -223,12 +250,17 @@ with status_col2:
 
 
 
+# 차트 라이브러리는 헤드라인 지표/유저 상태가 그려진 뒤에 로딩
+import plotly.express as px
+import altair as alt
+
+
 # Total usage 시계열 차트
 st.markdown("---")
 st.subheader("📅 Total Usage Over Time (All Functions)")
 
 # 1️⃣ 날짜별 전체 사용량 집계
-end_date = pd.Timestamp.now()
+end_date = pd.Timestamp(as_of) + pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)  # 기준 날짜 끝까지
 default_start = pd.Timestamp('2025-01-01')
 
 # 조직별 trial_start_date 확인
@@ -237,60 +269,83 @@ df_active_org = df_active.copy()
 # 2024년 trial_start_date를 가진 조직은 2025-01-01부터 시작하도록 조정
 df_active_org.loc[df_active_org['trial_start_date'].dt.year == 2024, 'trial_start_date'] = default_start
 
-# 각 조직별로 데이터 처리
-org_data_list = []
-for org in df_active_org['organization'].unique():
-    org_df = df_active_org[df_active_org['organization'] == org]
-    org_start = org_df['trial_start_date'].iloc[0]
-    
-    # 해당 조직의 날짜 범위 생성
-    org_dates = pd.date_range(start=org_start.date(), end=end_date.date(), freq='D')
-    org_date_df = pd.DataFrame({'created_at': org_dates})
-    
-    # 해당 조직의 실제 데이터 집계
-    org_counts = org_df.groupby(org_df["created_at"].dt.date).size().reset_index(name="count")
-    org_counts["created_at"] = pd.to_datetime(org_counts["created_at"])
-    
-    # 데이터 병합
-    org_daily = pd.merge(org_date_df, org_counts, on='created_at', how='left')
-    org_data_list.append(org_daily)
+# 집계 + figure 생성은 디스크 캐시에 없을 때만 (조직 / as_of / 데이터 버전별 차트 spec)
+def total_usage_figure():
+    # 각 조직별로 데이터 처리
+    org_data_list = []
+    for org in df_active_org['organization'].unique():
+        org_df = df_active_org[df_active_org['organization'] == org]
+        org_start = org_df['trial_start_date'].iloc[0]
+
+        # 해당 조직의 날짜 범위 생성
+        org_dates = pd.date_range(start=org_start.date(), end=end_date.date(), freq='D')
+        org_date_df = pd.DataFrame({'created_at': org_dates})
+
+        # 해당 조직의 실제 데이터 집계
+        org_counts = org_df.groupby(org_df["created_at"].dt.date).size().reset_index(name="count")
+        org_counts["created_at"] = pd.to_datetime(org_counts["created_at"])
+
+        # 데이터 병합
+        org_daily = pd.merge(org_date_df, org_counts, on='created_at', how='left')
+        org_data_list.append(org_daily)
+
+    # 모든 조직의 데이터 합치기
+    df_total_daily = pd.concat(org_data_list)
+    df_total_daily = df_total_daily.groupby('created_at')['count'].sum().reset_index()
+    df_total_daily['count'] = df_total_daily['count'].fillna(0)
+
+    # ✅ 2️⃣ 날짜 라벨 생성 (예: 7/11)
+    df_total_daily["date_label"] = df_total_daily["created_at"].dt.strftime("%-m/%d")  # macOS/Linux
+    # 윈도우는 "%#m/%d"
+
+    # ✅ Plotly 시계열 차트 (y축 상단 여유 포함)
+    fig1 = px.line(
+        df_total_daily,
+        x="created_at",  # date_label 대신 created_at 사용
+        y="count",
+        markers=True,
+        labels={"created_at": "Date", "count": "Total Event Count"},
+    )
 
-# 모든 조직의 데이터 합치기
-df_total_daily = pd.concat(org_data_list)
-df_total_daily = df_total_daily.groupby('created_at')['count'].sum().reset_index()
-df_total_daily['count'] = df_total_daily['count'].fillna(0)
+    # ✅ 차트 레이아웃 설정
+    fig1.update_layout(
+        height=300,
+        width=900,
+        xaxis=dict(
+            rangeslider=dict(visible=True),  # 하단에 슬라이더 추가
+            type="date",
+            tickformat="%Y-%m-%d",
+                        range=[df_total_daily['created_at'].min(), df_total_daily['created_at'].max()]  # x축 범위 설정
+        ),
+        margin=dict(l=50, r=50, t=30, b=50)  # 여백 조정
+    )
 
-# ✅ 2️⃣ 날짜 라벨 생성 (예: 7/11)
-df_total_daily["date_label"] = df_total_daily["created_at"].dt.strftime("%-m/%d")  # macOS/Linux
-# 윈도우는 "%#m/%d"
+    # ✅ y축 범위 자동보다 조금 더 크게 설정
+    max_count = df_total_daily["count"].max()
+    fig1.update_yaxes(range=[0, max_count + 10])
+    return fig1
 
-# ✅ Plotly 시계열 차트 (y축 상단 여유 포함)
-fig1 = px.line(
-    df_total_daily,
-    x="created_at",  # date_label 대신 created_at 사용
-    y="count",
-    markers=True,
-    labels={"created_at": "Date", "count": "Total Event Count"},
-)
 
-# ✅ 차트 레이아웃 설정
-fig1.update_layout(
-    height=300,
-    width=900,
-    xaxis=dict(
-        rangeslider=dict(visible=True),  # 하단에 슬라이더 추가
-        type="date",
-        tickformat="%Y-%m-%d",
-                    range=[df_total_daily['created_at'].min(), df_total_daily['created_at'].max()]  # x축 범위 설정
-    ),
-    margin=dict(l=50, r=50, t=30, b=50)  # 여백 조정
-)
+st.plotly_chart(cached_figure(total_usage_figure, as_of, version, selected_org), use_container_width=True)
 
-# ✅ y축 범위 자동보다 조금 더 크게 설정
-max_count = df_total_daily["count"].max()
-fig1.update_yaxes(range=[0, max_count + 10])
 
-st.plotly_chart(fig1, use_container_width=True)
+# ⏱️ 주별 절감 시간 (ROI ledger 합계, 유저별 누적 막대)
+st.markdown("### ⏱️ Time Saved per Week")
+df_saved_weekly = time_saved.weekly_hours(roi_ledger)
+if df_saved_weekly.empty:
+    st.info("No time-saved data for this organization.")
+else:
+    fig_saved = px.bar(
+        df_saved_weekly,
+        x="week",
+        y="saved_hours",
+        color="user_name",
+        labels={"week": "Week", "saved_hours": "Saved Hours", "user_name": "User"},
+        hover_data={"events": True},
+    )
+    fig_saved.update_layout(height=300, margin=dict(l=50, r=50, t=30, b=50), xaxis=dict(tickformat="%Y-%m-%d"))
+    st.plotly_chart(fig_saved, use_container_width=True)
+    st.caption(f"Saved-minutes model v{time_saved.model_version()} (saved_minutes.json), weeks start on Monday")
 
 
 
@@ -396,29 +451,16 @@ else:
 
     # 테이블 추가
     st.markdown("#### Daily Usage Table")
-    # 피벗 테이블 생성
-    df_user_filtered['date_col'] = df_user_filtered['created_at'].dt.strftime("%m/%d")
-    table_data = df_user_filtered.pivot_table(
+    # 피벗 테이블 생성 (날짜 순으로 피벗한 뒤 표시할 때만 연도 포함 문자열로 - 해가 바뀌어도 열이 겹치지 않음)
+    table_data = pivot_with_totals(
+        df_user_filtered[['user', 'created_at', 'count']],
         index='user',
-        columns='date_col',
-        values='count',
-        fill_value=0
+        columns='created_at',
+        values='count'
     )
-    
-    # Total 컬럼 추가
-    table_data['Total'] = table_data.sum(axis=1)
-    
-    # Total 기준으로 정렬
-    table_data = table_data.sort_values('Total', ascending=False)
-    
-    # Total을 맨 앞으로 이동
-    cols = ['Total'] + [col for col in table_data.columns if col != 'Total']
-    table_data = table_data[cols]
-    
-    # Total 행 추가
-    table_data.loc['Total'] = table_data.sum(numeric_only=True)
-    
-    st.dataframe(table_data.astype(int), use_container_width=True)
+    table_data = table_data.rename(columns=lambda col: col if col == 'Total' else col.strftime('%Y-%m-%d'))
+    st.dataframe(table_data, use_container_width=True)
+    download_buttons(table_data, f"{selected_org}_daily_usage_{as_of}", key="export_daily_usage")
 
 
 
@@ -430,7 +472,7 @@ st.markdown("---")
 try:
     trial_start = pd.to_datetime(df_org['trial_start_date'].iloc[0]).strftime('%Y-%m-%d')
 except (IndexError, pd.errors.OutOfBoundsDatetime):
-    trial_start = pd.Timestamp.now().strftime('%Y-%m-%d')
+    trial_start = pd.Timestamp(as_of).strftime('%Y-%m-%d')
 
 # View Mode 선택
 view_mode = st.radio(
@@ -443,57 +485,21 @@ view_mode = st.radio(
 st.subheader("📈 Weekly Function Usage Trends")
 
 if view_mode == f"Trial Period (Trial Start Date: {trial_start})":
-    # trial_start_date 기준으로 주차 계산
-    df_org['week_from_trial'] = ((df_org['created_at'] - df_org['trial_start_date'])
-                                .dt.days // 7 + 1)
-    
-    # trial_start_date와 같은 날짜(0)도 1주차로 처리
-    df_org.loc[df_org['week_from_trial'] <= 1, 'week_from_trial'] = 1
-    
-    # week 포맷팅 (소수점 제거)
-    df_org['week_from_trial'] = df_org['week_from_trial'].fillna(1)  # nan을 1로 처리
-    df_org['week_from_trial'] = df_org['week_from_trial'].map(lambda x: f'Trial Week {int(x)}')
-    
-    df_chart = df_org.groupby(['week_from_trial', 'agent_type']).size().reset_index(name='count')
+    # trial 주차: 코호트 엔진에서 전 조직 한 번에 계산한 값 사용 (df_org 직접 계산 X)
+    trial_cohorts = load_trial_cohorts(as_of, version)
+    df_org = df_org.assign(
+        week_from_trial=trial_cohorts['trial_week'].loc[df_org.index].map('Trial Week {}'.format)
+    )
     
-    # 누락된 week_from_trial, agent_type 조합 채워넣기
+    week_col = 'week_from_trial'
     all_weeks = sorted(df_org['week_from_trial'].unique())
-    all_agents = df_chart['agent_type'].unique()
-    all_combinations = pd.MultiIndex.from_product([all_weeks, all_agents], names=['week_from_trial', 'agent_type']).to_frame(index=False)
-    df_chart = pd.merge(all_combinations, df_chart, on=['week_from_trial', 'agent_type'], how='left')
-    df_chart['count'] = df_chart['count'].fillna(0).astype(int)
 else:
-    df_chart = df_org.groupby(['week_bucket', 'agent_type']).size().reset_index(name='count')
+    week_col = 'week_bucket'
+    all_weeks = sorted(week_ranges.keys())
 
-    # 누락된 week_bucket, agent_type 조합 채워넣기
-    all_weeks = list(week_ranges.keys())
-    all_agents = df_chart['agent_type'].unique()
-    all_combinations = pd.MultiIndex.from_product([all_weeks, all_agents], names=['week_bucket', 'agent_type']).to_frame(index=False)
-    df_chart = pd.merge(all_combinations, df_chart, on=['week_bucket', 'agent_type'], how='left')
-    df_chart['count'] = df_chart['count'].fillna(0).astype(int)
-
-# Pivot Table - 모드에 따라 컬럼 이름 변경
-if view_mode == "Recent 4 Weeks":
-    df_week_table = df_chart.pivot_table(
-        index='agent_type',
-        columns='week_bucket',
-        values='count',
-        fill_value=0,
-        aggfunc='sum'
-    )
-else:
-    df_week_table = df_chart.pivot_table(
-        index='agent_type',
-        columns='week_from_trial',
-        values='count',
-        fill_value=0,
-        aggfunc='sum'
-    )
-
-df_week_table['Total'] = df_week_table.sum(axis=1)
-df_week_table = df_week_table.sort_values('Total', ascending=False)
-df_week_table = df_week_table[['Total'] + [col for col in df_week_table.columns if col != 'Total']]
-df_week_table.loc['Total'] = df_week_table.sum(numeric_only=True)
+# 기능 × 주차 테이블 (없는 주차는 0) → 차트는 같은 테이블에서 long format으로
+df_week_table = pivot_with_totals(df_org[['agent_type', week_col]], index='agent_type', columns=week_col, column_order=all_weeks)
+df_chart = pivot_body(df_week_table)
 
 # 차트 정렬 순서 설정
 sorted_agent_order = df_week_table.drop("Total").index.tolist()
@@ -528,7 +534,24 @@ else:
         st.altair_chart(chart_week, use_container_width=True)
 
 with right:
-    st.dataframe(df_week_table.astype(int), use_container_width=True)
+    st.dataframe(df_week_table, use_container_width=True)
+    download_buttons(df_week_table, f"{selected_org}_weekly_functions_{as_of}", key="export_week_table")
+
+# 🧪 Trial 리텐션 (전 조직 코호트 행렬)
+if view_mode != "Recent 4 Weeks":
+    st.markdown("#### 🧪 Trial Retention")
+    retention_left, retention_right = st.columns([6, 6])
+    with retention_left:
+        st.caption("Active users in trial week N / all active users, by organization")
+        df_retention = trial_cohorts['retention'].rename(columns='W{}'.format)
+        st.dataframe(df_retention.style.format("{:.0%}"), use_container_width=True)
+    with retention_right:
+        st.caption("Same ratio by trial start date cohort")
+        df_cohort_retention = trial_cohorts['cohort_retention'].rename(columns='W{}'.format)
+        st.dataframe(df_cohort_retention.style.format("{:.0%}"), use_container_width=True)
+    st.caption("Events per active user by trial week")
+    df_depth = trial_cohorts['depth'].rename(columns='W{}'.format)
+    st.dataframe(df_depth.style.format("{:.1f}"), use_container_width=True)
 
 
 # 📊 Daily usage 시계열
@@ -538,7 +561,7 @@ st.subheader("📊 Daily Function Usage for a Selected Week")
 
 # 📅 주차 선택 - view mode에 따라 다르게
 if view_mode == "Recent 4 Weeks":
-    week_options = sorted(df_org['week_bucket'].dropna().unique(), reverse=True)
+    week_options = sorted(week_ranges.keys(), reverse=True)
     selected_week = st.selectbox("Select Week", week_options, key="daily_select_week")
     
     # 선택된 주차의 날짜 범위 계산
@@ -547,7 +570,7 @@ if view_mode == "Recent 4 Weeks":
 else:
     # Trial Period Mode
     # 모든 가능한 Trial Week 생성 (1주차부터 현재까지)
-    max_week = ((pd.Timestamp.now() - df_org['trial_start_date'].min()).days // 7) + 1
+    max_week = ((now - df_org['trial_start_date'].min()).days // 7) + 1
     week_options = [f'Trial Week {i}' for i in range(max_week, 0, -1)]
     selected_week = st.selectbox("Select Week", week_options, key="daily_select_week")
     
@@ -560,35 +583,25 @@ else:
     week_end = week_start + pd.Timedelta(days=6)
     week_dates = pd.date_range(week_start, week_end).date
 
-# 📆 선택된 주간 데이터 필터링 (df_active_org 사용)
-df_week = df_active_org[df_active_org['created_at'].dt.date.isin(week_dates)]
+# 📆 선택된 주간 데이터 필터링 (df_active_org 사용, 이진 탐색 구간)
+df_week = usage_data.time_slice(df_active_org, min(week_dates), max(week_dates))
 
 # 📊 일별-기능별 집계
 agent_types = df_active_org['agent_type'].unique()  # 전체 기능 목록 사용
 
-# 선택된 주의 모든 날짜와 기능 조합 생성
+# 기능 × 날짜 테이블 (선택 주의 모든 날짜 / 전체 기능, 없는 조합은 0)
 date_range = pd.date_range(start=min(week_dates), end=max(week_dates), freq='D')
-all_combinations = pd.MultiIndex.from_product(
-    [date_range, agent_types],
-    names=['created_at', 'agent_type']
-).to_frame(index=False)
-
-# 실제 데이터 집계
-df_day = df_week.groupby([df_week['created_at'].dt.date, 'agent_type']).size().reset_index(name='count')
-df_day['created_at'] = pd.to_datetime(df_day['created_at'])
-
-# 모든 날짜-기능 조합에 대해 데이터 병합 (없는 날짜는 0으로 표시)
-df_day = pd.merge(all_combinations, df_day, on=['created_at', 'agent_type'], how='left')
-df_day['count'] = df_day['count'].fillna(0).astype(int)
-
-# 📊 기능별 정렬 기준 계산 (많이 쓴 순서 → 아래층부터 쌓임)
-agent_order_by_volume = (
-    df_day.groupby('agent_type')['count']
-    .sum()
-    .sort_values(ascending=False)
-    .index.tolist()
+df_day_table = pivot_with_totals(
+    df_week[['agent_type']].assign(created_at=df_week['created_at'].dt.normalize()),
+    index='agent_type',
+    columns='created_at',
+    index_order=sorted(agent_types),
+    column_order=date_range.tolist()
 )
-agent_order_for_stack = agent_order_by_volume  # 많이 쓴 순서대로 스택
+df_day = pivot_body(df_day_table)
+
+# 📊 기능별 정렬 기준 (많이 쓴 순서 → 아래층부터 쌓임) = 테이블 Total 순서
+agent_order_for_stack = df_day_table.index.drop('Total').tolist()
 
 # 🔁 정렬 순서 적용
 df_day['agent_type'] = pd.Categorical(
@@ -634,23 +647,18 @@ with left2:
     st.plotly_chart(fig_day, use_container_width=True)
 
 with right2:
-    # 📊 집계 테이블 준비
-    df_day_table = df_day.pivot_table(
-        index='agent_type',
-        columns='created_at',
-        values='count',
-        fill_value=0,
-        aggfunc='sum'
+    # 📊 집계 테이블 (컬럼 이름은 mm-dd 형식)
+    st.dataframe(
+        df_day_table.rename(columns=lambda col: col if col == 'Total' else col.strftime('%m-%d')),
+        use_container_width=True
     )
-    
-    # 컬럼 이름을 mm-dd 형식으로 변경
-    df_day_table.columns = pd.to_datetime(df_day_table.columns).strftime('%m-%d')
-    df_day_table['Total'] = df_day_table.sum(axis=1)
-    df_day_table = df_day_table.sort_values('Total', ascending=False)
-    df_day_table = df_day_table[['Total'] + [col for col in df_day_table.columns if col != 'Total']]
-    df_day_table.loc['Total'] = df_day_table.sum(numeric_only=True)
-
-    st.dataframe(df_day_table.astype(int), use_container_width=True)
+    # 선택 주의 기능 × 날짜 표 / 해당 주 원본 이벤트
+    download_buttons(
+        df_day_table.rename(columns=lambda col: col if col == 'Total' else col.strftime('%Y-%m-%d')),
+        f"{selected_org}_{selected_week}_daily_functions",
+        key="export_day_table",
+    )
+    download_buttons(df_week, f"{selected_org}_{selected_week}_events", key="export_week_events", label="Events")
 
 
 # 👥 Function Usage by User
@@ -672,7 +680,7 @@ selected_user = st.selectbox(
 
 # 📅 주차 선택 - view mode에 따라 다르게
 if view_mode == "Recent 4 Weeks":
-    week_options = sorted(df_org['week_bucket'].dropna().unique(), reverse=True)
+    week_options = sorted(week_ranges.keys(), reverse=True)
     selected_week = st.selectbox("Select Week", week_options, key="user_week_select")
     
     # 선택된 주차의 날짜 범위 계산
@@ -695,8 +703,8 @@ else:
     week_end = week_start + pd.Timedelta(days=6)
     week_dates = pd.date_range(week_start, week_end).date
 
-# 선택된 주간 데이터 필터링
-df_user_week = df_org[df_org['created_at'].dt.date.isin(week_dates)]
+# 선택된 주간 데이터 필터링 (이진 탐색 구간)
+df_user_week = usage_data.time_slice(df_org, min(week_dates), max(week_dates))
 
 # 기본 집계 데이터 준비 (전체 유저)
 df_user_stack_full = df_user_week.groupby(['user_name', 'agent_type']).size().reset_index(name='count')
@@ -747,77 +755,33 @@ with left:
 with right:
     if selected_user == "All Users":
         # 전체 유저 요약 테이블
-        df_user_table = df_user_stack_full.pivot_table(
+        df_user_table = pivot_with_totals(
+            df_user_stack_full,
             index='agent_type',  # agent_type을 행으로
             columns='user_name',  # user를 열로
-            values='count',
-            aggfunc='sum',
-            fill_value=0
+            values='count'
         )
-        
-        # Total 컬럼 추가 및 정렬
-        df_user_table['Total'] = df_user_table.sum(axis=1)
-        df_user_table = df_user_table.sort_values('Total', ascending=False)
-        df_user_table = df_user_table[['Total'] + [col for col in df_user_table.columns if col != 'Total']]
-        
-        # Total 행 추가
-        df_user_table.loc['Total'] = df_user_table.sum(numeric_only=True)
-        
     else:
-        # 선택된 유저의 일별 상세 데이터
+        # 선택된 유저의 일별 상세 데이터 (선택 주의 모든 날짜 / 이번 주 사용 기능, 없는 조합은 0)
         df_user_detail = df_user_week[df_user_week['user_name'] == selected_user]
-        
-        # 모든 날짜와 agent_type 조합 생성
-        all_dates = pd.date_range(week_start, week_end).strftime('%m/%d')
-        all_agent_types = sorted_func_order
-        all_combinations = pd.MultiIndex.from_product(
-            [all_agent_types, all_dates],
-            names=['agent_type', 'date']
-        ).to_frame(index=False)
-        
-        # 실제 데이터 집계
-        df_user_detail['date'] = df_user_detail['created_at'].dt.strftime('%m/%d')
-        df_user_counts = df_user_detail.groupby(['agent_type', 'date']).size().reset_index(name='count')
-        
-        # 모든 조합과 실제 데이터 병합
-        df_user_counts = pd.merge(
-            all_combinations,
-            df_user_counts,
-            on=['agent_type', 'date'],
-            how='left'
-        ).fillna(0)
-        
-        # 피벗 테이블 생성
-        df_user_table = df_user_counts.pivot_table(
+        df_user_table = pivot_with_totals(
+            df_user_detail[['agent_type']].assign(date=df_user_detail['created_at'].dt.strftime('%m/%d')),
             index='agent_type',
             columns='date',
-            values='count',
-            fill_value=0
+            index_order=sorted_func_order,
+            column_order=pd.date_range(week_start, week_end).strftime('%m/%d').tolist()
         )
-        
-        # Total 컬럼 추가 및 정렬
-        df_user_table['Total'] = df_user_table.sum(axis=1)
-        df_user_table = df_user_table.sort_values('Total', ascending=False)
-        df_user_table = df_user_table[['Total'] + [col for col in df_user_table.columns if col != 'Total']]
-        
-        # Total 행 추가
-        df_user_table.loc['Total'] = df_user_table.sum(numeric_only=True)
-    
-    st.dataframe(df_user_table.astype(int), use_container_width=True)
+
+    st.dataframe(df_user_table, use_container_width=True)
+    download_buttons(df_user_table, f"{selected_org}_{selected_user}_{selected_week}_functions", key="export_user_table")
 
 
 # 📊 Response Time Analysis
 st.markdown("---")
 st.subheader("📈 LinqAlpha Response Time Analysis")
 
-# 데이터 전처리
-df_time = df_all.copy()
-# 이상치 처리
-df_time.loc[df_time['time_to_first_byte'] <= 0, 'time_to_first_byte'] = None
-df_time.loc[df_time['time_to_first_byte'] > 300000, 'time_to_first_byte'] = None  # 5분 초과 제거
-
-# ms를 초로 변환
-df_time['time_to_first_byte'] = df_time['time_to_first_byte'] / 1000
+# 데이터 전처리 (이상치 제거, ms를 초로 변환)
+df_time = usage_data.response_times(df_all)
 
 # 기본 통계량 표시
 col1, col2, col3 = st.columns(3)
@@ -844,7 +808,7 @@ daily_stats.columns = ['date', 'time_to_first_byte', 'total_events']
 
 # 2025년 4월 1일 이후, 오늘 제외 데이터만 필터링
 start_date = pd.Timestamp('2025-04-01').date()
-end_date = pd.Timestamp.now().date() - pd.Timedelta(days=1)
+end_date = as_of - pd.Timedelta(days=1)
 daily_stats = daily_stats[
     (daily_stats['date'] >= start_date) & 
     (daily_stats['date'] <= end_date)
@@ -875,9 +839,147 @@ fig1.update_layout(
     hovermode='x unified'
 )
 
+# 🚨 전체 일별 median이 rolling 기준선을 벗어난 날 표시 (TTFB 히스토그램 스케치 기준)
+latency_sketch = load_latency_sketch(version)
+daily_flags = latency.detect_anomalies(
+    latency_sketch.quantiles('D', start_date=start_date, end_date=end_date), metric='p50'
+)
+flagged_days = daily_flags.loc[daily_flags['anomaly'], 'period'].dt.date
+flagged_stats = daily_stats[daily_stats['date'].isin(flagged_days)]
+if not flagged_stats.empty:
+    fig1.add_scatter(
+        x=flagged_stats['date'],
+        y=flagged_stats['time_to_first_byte'],
+        mode='markers',
+        marker=dict(color='red', size=10, symbol='x'),
+        name='Regression',
+        hovertemplate="Regression: %{y:.1f} sec<extra></extra>"
+    )
+
 # 차트 표시
 st.plotly_chart(fig1, use_container_width=True)
 
+# 🚨 기능/조직별 응답 시간 급등 탐지 (직전 구간 rolling median + MAD 기준선)
+st.markdown("#### 🚨 Latency Regressions")
+reg_col1, reg_col2, reg_col3 = st.columns(3)
+with reg_col1:
+    regression_by = st.radio(
+        "Baseline per", ["Function", "Organization"], horizontal=True, key="latency_regression_by"
+    )
+with reg_col2:
+    regression_freq = st.radio("Granularity", ["Daily", "Hourly"], horizontal=True, key="latency_regression_freq")
+with reg_col3:
+    regression_metric = st.radio("Metric", ["p95", "p50"], horizontal=True, key="latency_regression_metric")
+
+regression_col = {"Function": "agent_type", "Organization": "organization"}[regression_by]
+# 일별: 직전 14일, 시간별: 직전 7일(168시간)을 기준선으로 사용
+regression_freq, regression_window = {"Daily": ("D", 14), "Hourly": ("h", 168)}[regression_freq]
+regression_stats = latency.detect_anomalies(
+    latency_sketch.quantiles(regression_freq, regression_col, start_date=start_date, end_date=end_date),
+    metric=regression_metric,
+    by=regression_col,
+    freq=regression_freq,
+    window=regression_window
+)
+
+fig_regression = px.line(
+    regression_stats,
+    x='period',
+    y=regression_metric,
+    color=regression_col,
+    title=f'{regression_metric.upper()} Response Time by {regression_by}',
+    labels={'period': 'Date', regression_metric: 'Response Time (seconds)', regression_col: regression_by}
+)
+regression_flags = regression_stats[regression_stats['anomaly']]
+if not regression_flags.empty:
+    fig_regression.add_scatter(
+        x=regression_flags['period'],
+        y=regression_flags[regression_metric],
+        mode='markers',
+        marker=dict(color='red', size=10, symbol='x'),
+        name='Regression',
+        customdata=regression_flags[[regression_col, 'baseline']],
+        hovertemplate="%{customdata[0]}: %{y:.1f} sec (baseline %{customdata[1]:.1f} sec)<extra></extra>"
+    )
+fig_regression.update_layout(height=400)
+st.plotly_chart(fig_regression, use_container_width=True)
+
+if regression_flags.empty:
+    st.caption("No latency regressions detected in this period.")
+else:
+    regression_table = regression_flags.sort_values('period', ascending=False)[
+        ['period', regression_col, regression_metric, 'baseline', 'count']
+    ]
+    regression_table.columns = ['Period', regression_by, 'Response Time (sec)', 'Baseline (sec)', 'Requests']
+    st.dataframe(
+        regression_table.round({'Response Time (sec)': 1, 'Baseline (sec)': 1}),
+        use_container_width=True,
+        hide_index=True
+    )
+
+# 🕐 시간대별 부하 / 응답 속도 (시간 단위 집계 기반)
+st.markdown("#### 🕐 Hourly Load & Latency")
+heat_col1, heat_col2, heat_col3, heat_col4 = st.columns(4)
+with heat_col1:
+    heatmap_org = st.selectbox(
+        "Organization", ["All Organizations"] + sorted(df_all['organization'].dropna().unique()), key="heatmap_org"
+    )
+with heat_col2:
+    heatmap_agent = st.selectbox(
+        "Function", ["All Functions"] + sorted(df_time['agent_type'].dropna().unique()), key="heatmap_agent"
+    )
+with heat_col3:
+    # 원본 created_at은 UTC - 아시아/미국 고객 업무 시간 기준으로 보기 위한 표시 시간대
+    heatmap_tz_label = st.selectbox(
+        "Timezone", ["UTC", "Hong Kong / Singapore (UTC+8)", "New York (US Eastern)"], key="heatmap_tz"
+    )
+with heat_col4:
+    heatmap_rows = st.radio("Rows", ["Weekday", "Day"], horizontal=True, key="heatmap_rows")
+
+heatmap_tz = {
+    "UTC": "UTC",
+    "Hong Kong / Singapore (UTC+8)": "Asia/Hong_Kong",
+    "New York (US Eastern)": "America/New_York",
+}[heatmap_tz_label]
+# 요일 패턴은 최근 12주, 날짜별은 최근 4주
+heatmap_days = 84 if heatmap_rows == "Weekday" else 28
+heatmap_events, heatmap_p95 = latency_sketch.heatmap(
+    rows=heatmap_rows.lower(),
+    tz=heatmap_tz,
+    start_date=as_of - pd.Timedelta(days=heatmap_days - 1),
+    end_date=as_of,
+    organization=None if heatmap_org == "All Organizations" else heatmap_org,
+    agent_type=None if heatmap_agent == "All Functions" else heatmap_agent
+)
+if heatmap_rows == "Day":
+    heatmap_events.index = heatmap_p95.index = heatmap_events.index.strftime('%Y-%m-%d')
+
+if heatmap_events.to_numpy().sum() == 0:
+    st.info("No events in the selected period.")
+else:
+    heat_left, heat_right = st.columns(2)
+    heatmap_labels = {'x': f'Hour ({heatmap_tz_label})', 'y': heatmap_rows}
+    with heat_left:
+        fig_events = px.imshow(
+            heatmap_events,
+            color_continuous_scale='Blues',
+            aspect='auto',
+            labels={**heatmap_labels, 'color': 'Events'},
+            title=f'Event Volume (last {heatmap_days} days)'
+        )
+        fig_events.update_xaxes(dtick=1)
+        st.plotly_chart(fig_events, use_container_width=True)
+    with heat_right:
+        fig_p95 = px.imshow(
+            heatmap_p95,
+            color_continuous_scale='Reds',
+            aspect='auto',
+            labels={**heatmap_labels, 'color': 'P95 (sec)'},
+            title=f'P95 Response Time (last {heatmap_days} days)'
+        )
+        fig_p95.update_xaxes(dtick=1)
+        st.plotly_chart(fig_p95, use_container_width=True)
+
 # 날짜 선택기 추가
 available_dates = sorted(daily_stats['date'].unique(), reverse=True)  # 내림차순 정렬
 selected_date = st.selectbox(
@@ -924,15 +1026,35 @@ if selected_date:
     st.markdown("#### Function Statistics")
     st.dataframe(func_stats, use_container_width=True)
 
-    # Slow Requests (상위 10개)
+    # Slow Requests (상위 10개) - 로딩 시 만든 top-K 인덱스에서 조회
     st.markdown("#### Slowest Requests")
-    slow_requests = selected_date_data.nlargest(10, 'time_to_first_byte')[
-        ['created_at', 'agent_type', 'time_to_first_byte', 'id']
-    ].copy()
-    slow_requests['created_at'] = slow_requests['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S')
-    slow_requests.columns = ['Timestamp', 'Function', 'Response Time (sec)', 'Request ID']
-    slow_requests = slow_requests.sort_values('Response Time (sec)', ascending=False)
-    st.dataframe(slow_requests, use_container_width=True)
+    slow_col1, slow_col2 = st.columns(2)
+    with slow_col1:
+        slow_range = st.radio(
+            "Range",
+            ["Selected Date", "Last 7 Days", "Last 30 Days"],
+            horizontal=True,
+            key="slow_requests_range"
+        )
+    with slow_col2:
+        slow_org = st.selectbox(
+            "Organization",
+            ["All Organizations"] + sorted(df_time['organization'].dropna().unique()),
+            key="slow_requests_org"
+        )
+    range_days = {"Selected Date": 1, "Last 7 Days": 7, "Last 30 Days": 30}[slow_range]
+    slow_requests = load_slow_request_index(as_of, version).top(
+        selected_date - pd.Timedelta(days=range_days - 1),
+        selected_date,
+        organization=None if slow_org == "All Organizations" else slow_org
+    )
+    if slow_requests.empty:
+        st.info("No timed requests in this range.")
+    else:
+        slow_requests['created_at'] = slow_requests['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        slow_requests.columns = ['Timestamp', 'Function', 'Response Time (sec)', 'Request ID', 'Organization']
+        slow_requests = slow_requests.sort_values('Response Time (sec)', ascending=False)
+        st.dataframe(slow_requests, use_container_width=True)
 
 # 두 번째 줄: 히스토그램과 도표
 left_col, right_col = st.columns([3, 2])  # 히스토그램이 더 넓게
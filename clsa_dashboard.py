@@ -3,6 +3,8 @@ import pandas as pd
 import plotly.express as px
 import altair as alt
 
+import time_saved
+
 # Load and filter CLSA data
 df_all = pd.read_csv("df_all.csv", parse_dates=["created_at"])
 df_clsa = df_all[df_all['organization'] == 'clsa'].copy()
@@ -11,9 +13,7 @@ df_clsa = df_all[df_all['organization'] == 'clsa'].copy()
 df_clsa['day_bucket'] = df_clsa['created_at'].dt.date
 df_clsa['week_bucket'] = pd.to_datetime(df_clsa['created_at']).dt.to_period('W').astype(str)
 df_clsa['agent_type'] = df_clsa['function_mode'].str.split(":").str[0]
-df_clsa['saved_minutes'] = df_clsa['agent_type'].map({
-    "deep_research": 40, "pulse_check": 30
-}).fillna(30)
+df_clsa['saved_minutes'] = time_saved.saved_minutes(df_clsa)
 
 # UI 구성
 st.set_page_config(page_title="CLSA Usage Dashboard", layout="wide")
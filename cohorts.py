@@ -0,0 +1,44 @@
+# Trial 주차: trial_start_date 기준 7일 단위 (시작일 이전/당일은 1주차)
+# trial_start_date가 없는 조직은 첫 이벤트 날짜를 시작일로 사용
+def trial_weeks(df):
+    first_event = df.groupby('organization')['created_at'].transform('min')
+    org_has_start = df.groupby('organization')['trial_start_date'].transform('count') > 0
+    trial_start = df['trial_start_date'].where(org_has_start, first_event)
+    weeks = (df['created_at'] - trial_start).dt.days // 7 + 1
+    return weeks.clip(lower=1).fillna(1).astype(int)
+
+
+# 전 조직 trial 코호트 행렬을 한 번에 계산
+# - active_users / events: (organization × trial week) 활성 유저 수, 이벤트 수
+# - retention: 조직 전체 활성 유저 대비 해당 주차 활성 유저 비율
+# - depth: 해당 주차 활성 유저당 이벤트 수
+# - cohort_retention: trial_start_date 코호트 × trial week 리텐션
+def build_trial_cohorts(df):
+    weeks = trial_weeks(df)
+    active = df['status'].eq('active') & df['created_at'].notna() & df['user_email'].notna()
+    events = df.loc[active, ['organization', 'trial_start_date', 'user_email']].assign(
+        trial_week=weeks[active]
+    )
+
+    grouped = events.groupby(['organization', 'trial_week'])['user_email']
+    active_users = grouped.nunique().unstack(fill_value=0).sort_index(axis=1)
+    event_counts = grouped.size().unstack(fill_value=0).sort_index(axis=1)
+    org_users = events.groupby('organization')['user_email'].nunique()
+
+    cohort_start = events['trial_start_date'].dt.date
+    cohort_users = events.groupby(cohort_start)['user_email'].nunique()
+    cohort_active = (
+        events.groupby([cohort_start, 'trial_week'])['user_email']
+        .nunique()
+        .unstack(fill_value=0)
+        .sort_index(axis=1)
+    )
+
+    return {
+        'trial_week': weeks,
+        'active_users': active_users,
+        'events': event_counts,
+        'retention': active_users.div(org_users, axis=0),
+        'depth': (event_counts / active_users.where(active_users > 0)).fillna(0),
+        'cohort_retention': cohort_active.div(cohort_users, axis=0),
+    }
@@ -0,0 +1,188 @@
+import functools
+import os
+
+import pandas as pd
+import streamlit as st
+
+import disk_cache
+import documents
+import exports
+import hierarchy
+import ingest
+import latency
+import shared_dataset
+import time_saved
+import usage_data
+from cohorts import build_trial_cohorts
+from slow_requests import build_slow_request_index
+from user_activity import UserActivityIndex
+
+
+# 기준 날짜 선택 (URL ?as_of=YYYY-MM-DD, 기본값 오늘)
+def as_of_control():
+    default = usage_data.parse_as_of(st.query_params.get("as_of"))
+    as_of = st.sidebar.date_input("As-of Date", value=default)
+    st.query_params["as_of"] = as_of.isoformat()
+    return as_of
+
+
+# 원본은 데이터 버전당 한 번 공유 메모리(Arrow IPC)에 publish, 프로세스는 읽기 전용으로 attach
+@st.cache_resource(show_spinner=False)
+def load_base(version):
+    return shared_dataset.load_shared()
+
+
+# as_of + 데이터 버전이 캐시 키 → 하루치 뷰를 한 번 계산해서 모든 세션이 공유
+# 세션별 복사본을 만들지 않도록 cache_resource 사용 - 호출하는 쪽에서 직접 수정하지 말 것
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_dataset(as_of, version):
+    return usage_data.events_as_of(load_base(version), as_of)
+
+
+@st.cache_data(show_spinner=False)
+def load_org_bounds(as_of, version):
+    return usage_data.org_bounds(load_dataset(as_of, version))
+
+
+# 조직 선택 목록 (active 이벤트 수 내림차순) - warmup.py도 이 순서로 상위 조직을 미리 계산
+@st.cache_data(show_spinner=False)
+@disk_cache.cached
+def load_org_event_counts(as_of, version):
+    return usage_data.org_event_counts(load_dataset(as_of, version))
+
+
+# 느린 요청 인덱스는 로딩 시 한 번 만들고 세션 간 공유 (조회만 하므로 cache_resource)
+@st.cache_resource(show_spinner=False, max_entries=8)
+def load_slow_request_index(as_of, version):
+    return build_slow_request_index(usage_data.response_times(load_dataset(as_of, version)))
+
+
+# 요약 테이블: index × columns 건수(values를 주면 합계) + Total 열/행
+# - index_order: 데이터에 없어도 0으로 표시할 행 / column_order: 열 순서 (없는 열은 0)
+# - 범주형 축으로 한 번에 집계 → 조합 생성 + merge 없이 0 채움
+# - 행은 Total 내림차순, Total 열은 맨 앞, 마지막 행이 Total
+@st.cache_data(show_spinner=False, max_entries=64)
+def pivot_with_totals(df, index, columns, values=None, index_order=None, column_order=None):
+    cols = list(column_order) if column_order is not None else sorted(df[columns].dropna().unique())
+    # pivot_table처럼 행/열 키가 비었거나 열 순서에 없는 행은 제외
+    df = df[df[index].notna() & df[columns].isin(cols)]
+    rows = sorted(set(df[index]) | set(pd.Index(index_order if index_order is not None else []).dropna()))
+    keys = pd.DataFrame({
+        'row': pd.Categorical(df[index], categories=rows),
+        'col': pd.Categorical(df[columns], categories=cols),
+        'value': df[values].to_numpy() if values is not None else 1,
+    })
+    table = keys.groupby(['row', 'col'], observed=False)['value'].sum().unstack(fill_value=0)
+    table = table.reindex(index=rows, columns=cols, fill_value=0)
+    table.index = pd.Index(rows, name=index)
+    table.columns = pd.Index(cols, name=columns)
+
+    table.insert(0, 'Total', table.sum(axis=1))
+    table = table.sort_values('Total', ascending=False)
+    table.loc['Total'] = table.sum()
+    return table.astype(int)
+
+
+# 표 / 이벤트 구간 다운로드 버튼 (CSV / XLSX / Parquet 한 줄)
+# 파일 내용은 버튼을 눌렀을 때만 생성 - rerun 중에는 아무 작업도 하지 않고 다른 섹션을 막지 않음
+# data: DataFrame (캐시된 데이터의 슬라이스 그대로 넘기면 복사 없음)
+def download_buttons(data, file_stem, key, label="Download", formats=tuple(exports.FORMATS)):
+    file_stem = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in file_stem)
+    with st.container(horizontal=True):
+        for fmt in formats:
+            name, mime = exports.FORMATS[fmt]
+            st.download_button(
+                f"⬇️ {label} ({name})",
+                data=functools.partial(exports.export_bytes, data, fmt),
+                file_name=f"{file_stem}.{fmt}",
+                mime=mime,
+                key=f"{key}_{fmt}",
+                on_click="ignore",
+            )
+
+
+# 요약 테이블 → (index, columns, count) long format (Total 제외, 0 포함) - 차트용
+def pivot_body(table):
+    body = table.drop(index='Total', columns='Total')
+    return body.stack().rename('count').reset_index()
+
+
+# 차트 spec(plotly figure dict)을 디스크 캐시에 보관 - 재시작 후에도 집계/figure 생성 없이 바로 그림
+# key에는 build 결과를 결정하는 값(as_of, 데이터 버전, 조직 등)을 모두 넣을 것
+def cached_figure(build, *key):
+    return disk_cache.get_or_set(
+        disk_cache.make_key(f"figure.{build.__name__}", *key),
+        lambda: build().to_plotly_json(),
+    )
+
+
+# 시간 단위 이벤트 수 + TTFB 히스토그램 (시간 × agent_type × 조직, ingest 시 만든 스냅샷)
+# 분위수 / 이상 탐지 / 히트맵은 원본 행을 다시 읽지 않음 - 조회 시 as_of로 기간 제한
+@st.cache_resource(show_spinner=False, max_entries=2)
+def load_latency_sketch(version):
+    return latency.load_hourly_sketch()
+
+
+# 전 조직 trial 코호트 행렬 (데이터 버전/as_of당 한 번)
+@st.cache_data(show_spinner=False)
+@disk_cache.cached
+def load_trial_cohorts(as_of, version):
+    return build_trial_cohorts(load_dataset(as_of, version))
+
+
+# 조직별 일 × 유저 활동 비트셋 (조회 전용, 세션 간 공유)
+@st.cache_resource(show_spinner=False, max_entries=8)
+@disk_cache.cached
+def load_user_activity(as_of, version):
+    return UserActivityIndex(load_dataset(as_of, version))
+
+
+# 조직 × 유저 × 주 절감 시간 ledger (데이터 버전 + 절감 시간 모델 버전별 스냅샷)
+# 모델(saved_minutes.json)을 바꾸면 model_version이 바뀌어 한 번만 다시 계산
+@st.cache_data(show_spinner=False)
+def load_roi_ledger(version, model_version):
+    return time_saved.load_ledger()
+
+
+# 조직 → division → department → 유저 단계별 롤업 (조회 전용, 세션 간 공유)
+@st.cache_resource(show_spinner=False, max_entries=8)
+@disk_cache.cached
+def load_hierarchy(as_of, version):
+    return hierarchy.HierarchyRollups(load_dataset(as_of, version))
+
+
+# ingest.py / watcher.py가 df_all.csv 갱신 직후 만든 user_directory.csv가 있고 df_all.csv보다 최신인지
+def _directory_is_current():
+    return (
+        os.path.exists(ingest.USER_DIRECTORY_PATH)
+        and os.path.getmtime(ingest.USER_DIRECTORY_PATH) >= os.path.getmtime(usage_data.DATA_PATH)
+    )
+
+
+# 유저 디렉터리 (ingest 시 생성되는 user_directory.csv)
+# 파일이 없거나 df_all.csv보다 오래됐으면 이벤트 로그 + users.xlsx 시트로 직접 구성
+@st.cache_data(show_spinner=False)
+def load_user_directory(version):
+    if _directory_is_current():
+        return pd.read_csv(ingest.USER_DIRECTORY_PATH, parse_dates=['first_seen', 'last_seen'])
+    if os.path.exists(ingest.USERS_PATH):
+        return ingest.build_user_directory(load_base(version), *ingest.read_user_sheets())
+    return ingest.build_user_directory(load_base(version))
+
+
+def user_directory_version():
+    if _directory_is_current():
+        return usage_data.data_version() + "/" + usage_data.data_version(ingest.USER_DIRECTORY_PATH)
+    if os.path.exists(ingest.USERS_PATH):
+        return usage_data.data_version() + "/" + usage_data.data_version(ingest.USERS_PATH)
+    return usage_data.data_version()
+
+
+# 문서 파이프라인 집계 (hello.xlsx 버전별 parquet 스냅샷)
+@st.cache_data(show_spinner=False)
+def load_document_summary(version):
+    return documents.load_document_summary()
+
+
+def document_version():
+    return usage_data.data_version(documents.DOCUMENTS_PATH)
@@ -0,0 +1,156 @@
+import functools
+import glob
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+
+import usage_data
+
+
+# 재시작/배포 후에도 남는 결과 캐시 (sqlite 파일 하나, 여러 Streamlit 프로세스가 같이 사용)
+CACHE_PATH = os.environ.get("DASHBOARD_DISK_CACHE", os.path.join(usage_data.SNAPSHOT_DIR, "results.sqlite"))
+MAX_BYTES = int(os.environ.get("DASHBOARD_DISK_CACHE_MB", 512)) * 1024 * 1024
+CACHE_FORMAT = 1  # 캐시하는 결과 구조가 바뀌면 올려서 이전 항목 무효화
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 조회 시각은 이 간격보다 오래된 경우에만 갱신 (읽기마다 쓰기 잠금을 잡지 않도록)
+TOUCH_INTERVAL = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+# 호출마다 새 연결 - 스레드/프로세스 간 연결 공유 없음
+# WAL 모드: 읽기는 쓰기와 동시에 가능, 쓰기끼리는 busy_timeout 동안 대기
+def _connect(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# 코드 지문: 대시보드 모듈 / 페이지 소스 전체의 해시 (프로세스당 한 번 계산)
+# 캐시한 함수는 usage_data / latency 등 다른 모듈의 계산도 부르므로 함수가 든 모듈만이 아닌 전체 기준
+# → 배포로 계산 코드가 바뀌면 CACHE_FORMAT을 올리지 않아도 이전 결과를 쓰지 않음 (옛 항목은 LRU로 정리)
+@functools.cache
+def code_version():
+    digest = hashlib.sha256()
+    paths = glob.glob(os.path.join(CODE_DIR, "*.py")) + glob.glob(os.path.join(CODE_DIR, "pages", "*.py"))
+    for path in sorted(paths):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+# (이름, 인자) → 캐시 키: 인자에 데이터 버전이 들어가므로 데이터가 바뀌면 자연스럽게 새 키
+def make_key(name, *args):
+    digest = hashlib.sha256(pickle.dumps(args, protocol=4)).hexdigest()
+    return f"{name}/v{CACHE_FORMAT}-{code_version()}/{digest}"
+
+
+_MISSING = object()
+
+
+def get(key, path=None):
+    path = path or CACHE_PATH
+    now = time.time()
+    try:
+        conn = _connect(path)
+    except sqlite3.Error:
+        return _MISSING
+    try:
+        row = conn.execute("SELECT value, accessed FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return _MISSING
+        if now - row[1] > TOUCH_INTERVAL:
+            conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+    except sqlite3.Error:
+        # 잠금 대기 초과는 캐시 미스로 처리 (다시 계산)
+        return _MISSING
+    finally:
+        conn.close()
+    try:
+        return pickle.loads(row[0])
+    except Exception:
+        # 깨진 항목 / 지금 코드로 복원할 수 없는 항목도 캐시 미스 (다시 계산한 값으로 덮어씀)
+        return _MISSING
+
+
+# 저장 후 전체 크기가 max_bytes를 넘으면 오래 조회되지 않은 항목부터 삭제 (LRU)
+# BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡아서 다른 프로세스의 저장/삭제와 섞이지 않음
+def put(key, value, path=None, max_bytes=None):
+    path = path or CACHE_PATH
+    max_bytes = MAX_BYTES if max_bytes is None else max_bytes
+    data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(data) > max_bytes:
+        return
+    now = time.time()
+    try:
+        conn = _connect(path)
+    except sqlite3.Error:
+        return
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+            (key, data, len(data), now, now),
+        )
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total > max_bytes:
+            evict = []
+            for old_key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                if total <= max_bytes:
+                    break
+                if old_key != key:
+                    evict.append((old_key,))
+                    total -= size
+            conn.executemany("DELETE FROM entries WHERE key = ?", evict)
+        conn.execute("COMMIT")
+    except sqlite3.Error:
+        # 저장 실패는 무시 (다음 요청에서 다시 계산)
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+    finally:
+        conn.close()
+
+
+# 캐시에 있으면 그대로, 없으면 build() 결과를 저장 후 반환
+def get_or_set(key, build, path=None):
+    value = get(key, path)
+    if value is _MISSING:
+        value = build()
+        put(key, value, path)
+    return value
+
+
+# 함수 결과를 디스크에 캐시 (키 = 함수 이름 + 인자, 인자는 pickle 가능해야 함)
+# st.cache_data / st.cache_resource 아래에 두면 프로세스 안에서는 메모리 캐시가 먼저 응답하고
+# 재시작 직후 첫 호출만 디스크에서 읽음
+def cached(func):
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args):
+        return get_or_set(make_key(name, *args), lambda: func(*args))
+    return wrapper
+
+
+# 항목 수 / 전체 크기 (warmup.py 출력용)
+def stats(path=None):
+    conn = _connect(path or CACHE_PATH)
+    try:
+        count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+    finally:
+        conn.close()
+    return {'entries': count, 'size_mb': size / 1024 / 1024}
@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import usage_data
+import xlsx_stream
+
+
+DOCUMENTS_PATH = "hello.xlsx"
+DOCUMENTS_SHEET = "Result 1"
+SUMMARY_FORMAT = 1
+
+# 문서 export에서 쓰는 열만 스트리밍으로 읽음 (public_urls / name 등 큰 문자열 열 제외)
+DOCUMENT_COLUMNS = [
+    'created_at', 'updated_at', 'doc_type', 'provider', 'embed_status', 'failed_reason',
+    'parse_failed_reason', 'parsed_file_key', 'page_count',
+]
+DIMENSIONS = ['day', 'provider', 'doc_type', 'failure_reason']
+COUNT_COLUMNS = ['documents', 'parsed', 'parse_failed', 'embedded', 'embed_failed', 'pages', 'resolved']
+
+
+# 문서 1건 = 1행 → 단계별 플래그
+# - parsed: 파싱 결과 파일 있음 / embedded: embed_status == 1
+# - 실패: failed_reason(임베딩) / parse_failed_reason(파싱)
+# - resolved: 임베딩 완료 또는 실패로 끝난 문서 (updated_at 날짜에 처리된 것으로 봄)
+def load_documents(path=DOCUMENTS_PATH):
+    df = xlsx_stream.read_xlsx(path, sheet=DOCUMENTS_SHEET, columns=DOCUMENT_COLUMNS)
+    created_at = pd.to_datetime(df['created_at'], format='mixed', errors='coerce')
+    updated_at = pd.to_datetime(df['updated_at'], format='mixed', errors='coerce')
+    embedded = df['embed_status'].eq(1)
+    embed_failed = df['failed_reason'].notna()
+    parse_failed = df['parse_failed_reason'].notna()
+    return pd.DataFrame({
+        'created_day': created_at.dt.normalize(),
+        'resolved_day': updated_at.dt.normalize().where(embedded | embed_failed | parse_failed),
+        'provider': df['provider'].fillna('unknown'),
+        'doc_type': df['doc_type'].fillna('unknown'),
+        'failure_reason': df['failed_reason'].fillna(df['parse_failed_reason']),
+        'parsed': df['parsed_file_key'].notna(),
+        'parse_failed': parse_failed,
+        'embedded': embedded,
+        'embed_failed': embed_failed,
+        'pages': df['page_count'].fillna(0),
+    })
+
+
+# 일 × provider × doc_type × 실패 사유 집계
+# 생성 건수/단계별 건수는 생성일 기준, resolved는 처리일 기준으로 더함
+def build_document_summary(docs):
+    created = docs.rename(columns={'created_day': 'day'}).assign(documents=1, resolved=0)
+    resolved = docs.dropna(subset=['resolved_day']).rename(columns={'resolved_day': 'day'})
+    resolved = resolved[DIMENSIONS].assign(resolved=1)
+    summary = (
+        pd.concat([created[DIMENSIONS + COUNT_COLUMNS], resolved], ignore_index=True)
+        .fillna({col: 0 for col in COUNT_COLUMNS})
+        .groupby(DIMENSIONS, dropna=False, observed=True)[COUNT_COLUMNS].sum()
+        .reset_index()
+    )
+    return summary.astype({col: np.int64 for col in COUNT_COLUMNS})
+
+
+# 집계 결과를 export 버전(mtime/size)별 parquet 스냅샷으로 보관 - 페이지는 원본 엑셀을 읽지 않음
+def load_document_summary(path=DOCUMENTS_PATH, snapshot_dir=usage_data.SNAPSHOT_DIR):
+    version = usage_data.data_version(path)
+    snapshot_path = os.path.join(snapshot_dir, f"documents-{version}-v{SUMMARY_FORMAT}.parquet")
+    if os.path.exists(snapshot_path):
+        return pd.read_parquet(snapshot_path)
+
+    summary = build_document_summary(load_documents(path))
+    usage_data.write_snapshot(summary, snapshot_path)
+    return summary
+
+
+# 단계별 성공률 (by: 묶을 차원, 예: ['provider', 'doc_type'])
+def success_rates(summary, by):
+    totals = summary.groupby(by, observed=True)[COUNT_COLUMNS].sum()
+    rates = pd.DataFrame({
+        'Documents': totals['documents'],
+        'Parsed %': totals['parsed'] / totals['documents'] * 100,
+        'Embedded %': totals['embedded'] / totals['documents'] * 100,
+        'Failed %': (totals['embed_failed'] + totals['parse_failed']) / totals['documents'] * 100,
+        'Backlog': totals['documents'] - totals['resolved'],
+    })
+    return rates.round(1)
+
+
+# 일별 생성/처리 건수와 누적 backlog (= 누적 생성 - 누적 처리), 빈 날짜는 0으로 채움
+# by를 주면 그 차원별 backlog (long format: day, by, backlog)
+def daily_backlog(summary, by=None):
+    days = pd.date_range(summary['day'].min(), summary['day'].max(), freq='D', name='day')
+    if by is None:
+        daily = summary.groupby('day')[['documents', 'resolved']].sum().reindex(days, fill_value=0)
+        daily['backlog'] = daily['documents'].cumsum() - daily['resolved'].cumsum()
+        return daily.reset_index()
+    daily = summary.groupby(['day', by])[['documents', 'resolved']].sum().unstack(by, fill_value=0)
+    daily = daily.reindex(days, fill_value=0)
+    backlog = daily['documents'].cumsum() - daily['resolved'].cumsum()
+    return backlog.stack().rename('backlog').reset_index()
@@ -0,0 +1,92 @@
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+CHUNKSIZE = 50000
+XLSX_MAX_ROWS = 1048576  # 시트당 최대 행 (헤더 포함)
+FORMATS = {
+    'csv': ("CSV", "text/csv"),
+    'xlsx': ("XLSX", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    'parquet': ("Parquet", "application/vnd.apache.parquet"),
+}
+
+
+# DataFrame을 chunksize 행씩 (iloc 슬라이스 - 복사 없음)
+def iter_chunks(df, chunksize=CHUNKSIZE):
+    for start in range(0, max(len(df), 1), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+# 인덱스가 의미 있는 표(피벗 등)는 열로 꺼내서 내보냄
+# 이름 없는 정수 인덱스(RangeIndex / 필터링 후 남은 행 번호)는 위치일 뿐이라 버림
+def _flatten(df):
+    index = df.index
+    if index.nlevels == 1 and index.name is None and pd.api.types.is_integer_dtype(index.dtype):
+        return df.reset_index(drop=True)
+    return df.reset_index()
+
+
+def write_csv(df, f, chunksize=CHUNKSIZE):
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+    for i, chunk in enumerate(iter_chunks(df, chunksize)):
+        chunk.to_csv(text, index=False, header=i == 0)
+    text.flush()
+    text.detach()
+
+
+# 표 전체 기준 스키마 - 앞쪽 chunk에서 전부 결측인 열은 처음 나오는 값으로 타입 결정
+def _parquet_schema(df, chunksize):
+    schema = pa.Schema.from_pandas(df.iloc[:chunksize], preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            sample = df[field.name].dropna().iloc[:1]
+            if len(sample):
+                inferred = pa.Schema.from_pandas(sample.to_frame(), preserve_index=False).field(0)
+                schema = schema.set(i, field.with_type(inferred.type))
+    return schema
+
+
+# chunk마다 row group 하나
+def write_parquet(df, f, chunksize=CHUNKSIZE):
+    schema = _parquet_schema(df, chunksize)
+    with pq.ParquetWriter(f, schema) as writer:
+        for chunk in iter_chunks(df, chunksize):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+# openpyxl write-only 모드: 행을 바로 파일로 흘려보내고 셀 객체를 메모리에 쌓지 않음
+# 시트 최대 행 수를 넘으면 다음 시트로 이어서 씀
+def write_xlsx(df, f, chunksize=CHUNKSIZE, sheet_name="Export"):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    header = [str(col) for col in df.columns]
+    sheet, rows, n_sheets = None, XLSX_MAX_ROWS, 0
+    for chunk in iter_chunks(df, chunksize):
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if rows == XLSX_MAX_ROWS:
+                n_sheets += 1
+                sheet = workbook.create_sheet(sheet_name if n_sheets == 1 else f"{sheet_name} {n_sheets}")
+                sheet.append(header)
+                rows = 1
+            sheet.append(row)
+            rows += 1
+    if sheet is None:  # 빈 표도 헤더는 기록
+        workbook.create_sheet(sheet_name).append(header)
+    workbook.save(f)
+
+
+WRITERS = {'csv': write_csv, 'xlsx': write_xlsx, 'parquet': write_parquet}
+
+
+# 표 → 내보내기 파일 내용 (bytes, 완성된 파일 전체가 메모리에 올라감)
+# st.download_button이 bytes를 받으므로 BytesIO에 바로 씀 - 다운로드 버튼을 눌렀을 때만 호출됨
+# 인코딩은 chunk 단위라 표 전체를 CSV 문자열 / 엑셀 셀 객체로 한꺼번에 만들지는 않음
+def export_bytes(df, fmt, chunksize=CHUNKSIZE):
+    f = io.BytesIO()
+    WRITERS[fmt](_flatten(df), f, chunksize)
+    return f.getvalue()
@@ -0,0 +1,74 @@
+import pandas as pd
+
+
+# 조직 → division → department → 유저 계층 (department는 이벤트 로그에 열이 있을 때만)
+HIERARCHY_LEVELS = ['organization', 'division', 'department', 'user_name']
+UNASSIGNED = "(unassigned)"
+WEEKS = ['week1', 'week2', 'week3', 'week4']
+
+
+# 계층 단계별 롤업을 한 번에 미리 계산 (as_of 시점 스냅샷 기준)
+# - summary[depth]: 경로(앞 depth개 단계) → 이벤트 수 / 유저 수 / 주차별 이벤트 / 마지막 사용일
+# - functions[depth]: 경로 × function_mode × week_bucket 이벤트 수
+# 조회는 MultiIndex 정렬 구간 슬라이스라 유저 수가 많아도 원본 행을 다시 훑지 않음
+class HierarchyRollups:
+    def __init__(self, df):
+        self.levels = [level for level in HIERARCHY_LEVELS if level in df.columns]
+        active = df['status'].eq('active') & df['created_at'].notna()
+        events = df.loc[active, self.levels + ['user_email', 'function_mode', 'week_bucket', 'created_at']]
+        events = events.assign(**{
+            level: events[level].fillna(UNASSIGNED) for level in self.levels[1:-1]
+        })
+        events = events.assign(
+            user_name=events['user_name'].fillna(events['user_email']).fillna(UNASSIGNED),
+            function_mode=events['function_mode'].fillna('unknown'),
+        ).dropna(subset=['organization'])
+
+        self.summary, self.functions = {}, {}
+        for depth in range(len(self.levels) + 1):
+            keys = self.levels[:depth]
+            self.summary[depth] = self._summarize(events, keys)
+            functions = events.groupby(keys + ['function_mode', 'week_bucket']).size()
+            self.functions[depth] = functions.rename('count').sort_index()
+
+    @staticmethod
+    def _summarize(events, keys):
+        # depth 0 (전체)은 상수 키 하나로 묶음
+        by = [events[key] for key in keys] or [pd.Series('All', index=events.index, name='root')]
+        grouped = events.groupby(by)
+        weeks = pd.crosstab(by, events['week_bucket']).reindex(columns=WEEKS, fill_value=0)
+        summary = pd.DataFrame({
+            'Events': grouped.size(),
+            'Users': grouped['user_email'].nunique(),
+            'Last Active': grouped['created_at'].max().dt.date,
+        })
+        summary = summary.join(weeks).fillna({week: 0 for week in WEEKS})
+        return summary.astype({week: int for week in WEEKS}).sort_index()
+
+    # 경로(단계 값 tuple)의 바로 아래 단계 행들 (이벤트 수 내림차순)
+    def children(self, path):
+        depth = len(path)
+        if depth >= len(self.levels):
+            return self.summary[depth].iloc[0:0]
+        table = self.summary[depth + 1]
+        if depth:
+            table = table.xs(tuple(path), level=list(range(depth)), drop_level=True)
+        return table.sort_values('Events', ascending=False)
+
+    # 경로 노드 자체의 요약 (한 행)
+    def node(self, path):
+        table = self.summary[len(path)]
+        if not path:
+            return table.iloc[0]
+        return table.loc[tuple(path) if len(path) > 1 else path[0]]
+
+    # 경로 노드의 function_mode × week_bucket 이벤트 수 (long format)
+    def function_weeks(self, path):
+        counts = self.functions[len(path)]
+        if path:
+            levels = list(range(len(path)))
+            try:
+                counts = counts.xs(tuple(path), level=levels, drop_level=True)
+            except KeyError:  # 최근 4주에 이벤트가 없는 노드
+                counts = counts.iloc[0:0].droplevel(levels)
+        return counts.reset_index()
@@ -0,0 +1,508 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import latency
+import time_saved
+import usage_data
+import xlsx_stream
+
+
+USERS_PATH = "users.xlsx"
+# 생성물 (저장소 미포함): df_all.csv를 갱신하는 ingest.py / watcher.py가 그때마다 다시 만듦
+USER_DIRECTORY_PATH = "user_directory.csv"
+EVENT_INDEX_DIR = os.path.join(usage_data.SNAPSHOT_DIR, "event_index")
+INDEX_ARRAYS = ['keys', 'rows', 'hashes']
+DELTA_COMPACT_ROWS = 100000
+
+EVENT_COLUMNS = [
+    'id', 'selected_model', 'sender', 'function_mode', 'user_name', 'user_email', 'user_group',
+    'organization', 'time_to_first_byte', 'created_at', 'status', 'division', 'trial_start_date',
+    'earnings', 'briefing',
+]
+# catalysts export에서 쓰는 열 (Stock IDs / Tickers 등 큰 문자열 열은 읽지 않음)
+CATALYST_EXPORT_COLUMNS = ['ID', 'User Email', 'Organization', 'Created At']
+# catalysts 행은 기존 df_all.csv에 id가 없으므로 항상 합성 키 사용
+SYNTHETIC_KEY_COLUMNS = ['organization', 'user_email', 'created_at', 'function_mode', 'status']
+
+# 같은 (organization, user_email)이 여러 소스에 있으면 앞쪽 상태 우선
+STATUS_PRIORITY = ['active', 'inactive', 'joined_no_usage', 'invited_not_joined']
+DIRECTORY_COLUMNS = [
+    'organization', 'user_email', 'user_name', 'status', 'division',
+    'earnings', 'briefing', 'first_seen', 'last_seen', 'events',
+]
+
+
+def normalize_email(emails):
+    return emails.str.strip().str.lower()
+
+
+# users.xlsx 전체 시트 → (joined, invited) 두 테이블
+# invited 시트에 조직명이 비어 있으면 같은 회사 joined 시트의 조직명 사용
+def read_user_sheets(path=USERS_PATH):
+    joined, invited = [], []
+    for sheet_name, sheet in pd.read_excel(path, sheet_name=None).items():
+        sheet = sheet.assign(sheet=sheet_name.removesuffix('_invited'))
+        (invited if sheet_name.endswith('_invited') else joined).append(sheet)
+    joined = pd.concat(joined, ignore_index=True)
+    invited = pd.concat(invited, ignore_index=True)
+
+    sheet_org = joined.dropna(subset=['organization']).groupby('sheet')['organization'].first()
+    invited['organization'] = invited['organization'].fillna(invited['sheet'].map(sheet_org))
+    return joined, invited
+
+
+# 메시지/카탈리스트 export 한 파일 → df_all.csv 컬럼 구조 (sender == 'user'만)
+# reader는 스트리밍 xlsx reader (columns=로 필요한 열만 선택)
+def read_export(path, reader=xlsx_stream.read_xlsx):
+    is_catalyst = 'catalyst' in os.path.basename(path).lower()
+    df = reader(path, columns=CATALYST_EXPORT_COLUMNS if is_catalyst else None)
+    df.columns = df.columns.str.lower().str.replace(' ', '_')
+    if is_catalyst:
+        df = df.assign(function_mode='catalysts', sender='user')
+    df = df[df['sender'] == 'user'].reindex(columns=EVENT_COLUMNS)
+    df['user_email'] = normalize_email(df['user_email'])
+    df['created_at'] = pd.to_datetime(df['created_at'])
+    df['status'] = 'active'
+    return df
+
+
+# 이벤트 키 (uint64): 메시지는 id, catalysts / id 없는 행은 합성 키 해시
+def event_keys(df):
+    id_keys = pd.util.hash_pandas_object(df['id'].astype(object), index=False).to_numpy()
+    synthetic = df[SYNTHETIC_KEY_COLUMNS].astype({'created_at': 'datetime64[ns]'})
+    synthetic = synthetic.astype({col: object for col in SYNTHETIC_KEY_COLUMNS if col != 'created_at'})
+    synthetic_keys = pd.util.hash_pandas_object(synthetic, index=False).to_numpy()
+    use_id = (df['id'].notna() & df['function_mode'].ne('catalysts')).to_numpy()
+    return np.where(use_id, id_keys, synthetic_keys)
+
+
+# 행 내용 해시 (uint64): 다시 들어온 행이 저장된 행과 같은지 df_all.csv를 읽지 않고 판단
+# 날짜는 ns 정수, 숫자는 float, 결측은 None으로 맞춤 (CSV 왕복 / xlsx 읽기의 타입 차이 무시)
+def content_hashes(df):
+    canonical = {}
+    for col in EVENT_COLUMNS:
+        values = df[col] if col in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if col in ('created_at', 'trial_start_date'):
+            canonical[col] = pd.to_datetime(values).astype('datetime64[ns]').to_numpy().view('i8')
+            continue
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            values = values.astype(float)
+        canonical[col] = values.astype(object).where(values.notna(), None)
+    return pd.util.hash_pandas_object(pd.DataFrame(canonical, index=df.index), index=False).to_numpy()
+
+
+# 새 행 보강용 조회 테이블 (유저 수 크기): 이메일 → 마지막 이름 / 조직, 조직 → 첫 trial 시작일
+def empty_lookup():
+    return {
+        'user_name': pd.Series(dtype=object),
+        'organization': pd.Series(dtype=object),
+        'trial_start_date': pd.Series(dtype='datetime64[ns]'),
+    }
+
+
+# 조회 테이블에 rows 반영 (이름/조직은 뒤에 나온 값 우선, trial 시작일은 처음 값 유지)
+def update_lookup(lookup, rows):
+    lookup = dict(lookup)
+    known = rows.dropna(subset=['user_email'])
+    for col in ['user_name', 'organization']:
+        values = known.dropna(subset=[col]).drop_duplicates('user_email', keep='last').set_index('user_email')[col]
+        merged = pd.concat([lookup[col], values])
+        lookup[col] = merged[~merged.index.duplicated(keep='last')]
+    trial_start = rows.dropna(subset=['trial_start_date']).groupby('organization')['trial_start_date'].first()
+    merged = pd.concat([lookup['trial_start_date'], pd.to_datetime(trial_start)])
+    lookup['trial_start_date'] = merged[~merged.index.duplicated(keep='first')]
+    return lookup
+
+
+# 새 export 행 보강: 조회 테이블(EventStore.lookup)/유저 디렉터리에서 이름, 조직, trial 시작일, division 등 채우기
+# 같은 export 안의 다른 행에 있는 이름/조직도 사용
+def enrich_events(new, lookup, directory=None):
+    known = update_lookup(lookup, new)
+    new = new.copy()
+    new['user_name'] = new['user_name'].fillna(new['user_email'].map(known['user_name']))
+    new['organization'] = new['organization'].fillna(new['user_email'].map(known['organization']))
+    new['trial_start_date'] = new['trial_start_date'].fillna(new['organization'].map(lookup['trial_start_date']))
+    if directory is not None:
+        attributes = directory.set_index(['organization', 'user_email'])[['division', 'earnings', 'briefing']]
+        keys = pd.MultiIndex.from_frame(new[['organization', 'user_email']])
+        for col in ['division', 'earnings', 'briefing']:
+            new[col] = new[col].fillna(pd.Series(attributes[col].reindex(keys).to_numpy(), index=new.index))
+    return new
+
+
+# df_all.csv + 영속 인덱스 (.cache/event_index/)
+# - base: 키 순으로 정렬된 키 / 행 번호 / 행 내용 해시 (.npy, memory map - 이진 탐색에 필요한 페이지만 읽음)
+# - delta: 마지막으로 base에 합친 뒤 추가된 행 (작은 npz, 커지면 base로 합침)
+# - lookup: 새 행 보강용 조회 테이블 (json)
+# upsert는 새 행 키만 찾아보고, 같은 내용으로 다시 들어온 행은 건너뛰고, 새 행은 CSV 끝에 append
+# df_all.csv 전체(self.events)는 기존 행 내용이 바뀔 때만 읽음 - 그때는 CSV 전체 재작성 + 인덱스 재구성
+# (행 단위 해시라 export에 비어 있는 컬럼이 저장된 행에는 채워져 있으면 - TTFB 없는 export 등 - 값이 같아도 전체를 읽어 비교)
+class EventStore:
+    def __init__(self, path=usage_data.DATA_PATH, index_dir=EVENT_INDEX_DIR):
+        self.path = path
+        self.index_dir = index_dir
+        exists = os.path.exists(path)
+        self.version = usage_data.data_version(path) if exists else None
+        self.columns = pd.read_csv(path, nrows=0).columns.tolist() if exists else EVENT_COLUMNS
+        self._events = None
+        self.pending = []  # self.events를 읽기 전에 들어온 새 행 (save 때 CSV 끝에 append)
+        self.appended = 0  # self.events를 읽은 뒤 끝에 붙인, 아직 CSV에 없는 행 수
+        self.rewrite = False
+        self.added, self.removed = [], []  # 마지막 take_changes 이후 추가/교체된 행 (파생 스냅샷 증분 갱신용)
+        if not self._load_index():
+            self._rebuild_index()
+
+    # df_all.csv 전체 (처음 접근할 때 읽음) + 아직 쓰지 않은 새 행
+    @property
+    def events(self):
+        if self._events is None:
+            if os.path.exists(self.path):
+                events = pd.read_csv(self.path, parse_dates=['created_at', 'trial_start_date'])
+            else:
+                events = pd.DataFrame(columns=self.columns)
+            self.appended = sum(len(rows) for rows in self.pending)
+            self._events = pd.concat([events] + self.pending, ignore_index=True) if self.pending else events
+            self.pending = []
+        return self._events
+
+    def _index_file(self, name):
+        return os.path.join(self.index_dir, name)
+
+    def _load_index(self):
+        try:
+            delta = np.load(self._index_file("delta.npz"))
+            if str(delta['version']) != str(self.version):
+                return False
+            base = tuple(np.load(self._index_file(f"base-{name}.npy"), mmap_mode='r') for name in INDEX_ARRAYS)
+            if len(base[0]) != int(delta['base_size']):
+                return False
+            with open(self._index_file("lookup.json")) as f:
+                lookup = json.load(f)
+        except (FileNotFoundError, KeyError, ValueError):
+            return False
+        self.base = base
+        self.delta = tuple(delta[name] for name in INDEX_ARRAYS)
+        self.n_rows = int(delta['n_rows'])
+        self.lookup = {col: pd.Series(values, dtype=object) for col, values in lookup.items()}
+        self.lookup['trial_start_date'] = pd.to_datetime(self.lookup['trial_start_date'])
+        self.base_saved = True
+        return True
+
+    # 인덱스가 없거나 오래됨 → 한 번만 전체 재구성 (기존 중복도 이때 제거)
+    def _rebuild_index(self):
+        events = self.events
+        keys = event_keys(events)
+        duplicated = pd.Series(keys).duplicated(keep='last').to_numpy()
+        if duplicated.any():
+            self._events = events = events[~duplicated].reset_index(drop=True)
+            keys = keys[~duplicated]
+            self.rewrite = True
+        self._index_rows(events, keys)
+
+    def _index_rows(self, events, keys):
+        order = np.argsort(keys, kind='stable')
+        self.base = (keys[order], order, content_hashes(events)[order])
+        self.delta = tuple(np.zeros(0, dtype=array.dtype) for array in self.base)
+        self.n_rows = len(events)
+        self.lookup = update_lookup(empty_lookup(), events)
+        self.base_saved = False
+
+    # 키 → (행 번호, 내용 해시), 없으면 행 번호 -1
+    def _find(self, keys):
+        rows = np.full(len(keys), -1, dtype=np.int64)
+        hashes = np.zeros(len(keys), dtype=np.uint64)
+        for index_keys, index_rows, index_hashes in (self.base, self.delta):
+            pos = np.searchsorted(index_keys, keys)
+            hit = pos < len(index_keys)
+            hit[hit] = index_keys[pos[hit]] == keys[hit]
+            rows[hit] = index_rows[pos[hit]]
+            hashes[hit] = index_hashes[pos[hit]]
+        return rows, hashes
+
+    # 반환: (추가된 행 수, 변경된 행 수)
+    def upsert(self, new):
+        new = new.reindex(columns=self.columns)
+        keys = event_keys(new)
+        latest = ~pd.Series(keys).duplicated(keep='last').to_numpy()
+        new, keys = new[latest].reset_index(drop=True), keys[latest]
+        hashes = content_hashes(new)
+        rows, stored = self._find(keys)
+        found = rows >= 0
+
+        # 기존 행: 내용이 같으면 건너뜀, 다르면 새 값 우선 + 비어 있는 컬럼은 기존 값 유지
+        updated = 0
+        touched = found & (stored != hashes)
+        if touched.any():
+            events = self.events
+            current = events.iloc[rows[touched]]
+            merged = new[touched].astype(events.dtypes.to_dict()).set_axis(current.index).combine_first(current)
+            merged = merged[current.columns]
+            changed = ~(merged.eq(current) | (merged.isna() & current.isna())).all(axis=1)
+            if changed.any():
+                self.removed.append(current[changed])
+                self.added.append(merged[changed])
+                events.loc[changed[changed].index] = merged[changed]
+                self.rewrite = True
+                updated = int(changed.sum())
+
+        # 새 행: delta 인덱스에 정렬 삽입하고 CSV append 대기
+        inserts = new[~found]
+        if len(inserts):
+            insert_keys, insert_hashes = keys[~found], hashes[~found]
+            order = np.argsort(insert_keys, kind='stable')
+            at = np.searchsorted(self.delta[0], insert_keys[order])
+            values = (insert_keys[order], self.n_rows + order, insert_hashes[order])
+            self.delta = tuple(np.insert(array, at, value) for array, value in zip(self.delta, values))
+            self.n_rows += len(inserts)
+            if self._events is None:
+                self.pending.append(inserts)
+            else:
+                self._events = pd.concat(
+                    [self._events, inserts.astype(self._events.dtypes.to_dict())], ignore_index=True
+                )
+                self.appended += len(inserts)
+            self.added.append(inserts)
+        self.lookup = update_lookup(self.lookup, new)
+        return len(inserts), updated
+
+    # (추가된 행 + 바뀐 행의 새 값, 바뀐 행의 이전 값) - 꺼낸 뒤 비움
+    def take_changes(self):
+        empty = pd.DataFrame(columns=self.columns)
+        added = pd.concat(self.added, ignore_index=True) if self.added else empty
+        removed = pd.concat(self.removed, ignore_index=True) if self.removed else empty
+        self.added, self.removed = [], []
+        return added, removed
+
+    # 추가만 있으면 CSV 끝에 append, 기존 행이 바뀌었으면 전체 재작성 (임시 파일 → 교체)
+    def save(self):
+        if self.rewrite or not os.path.exists(self.path):
+            events = self.events
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            events.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self.path)
+            self._index_rows(events, event_keys(events))
+        elif self.pending:
+            pd.concat(self.pending, ignore_index=True).to_csv(self.path, mode='a', header=False, index=False)
+        elif self.appended:
+            self._events.iloc[len(self._events) - self.appended:].to_csv(
+                self.path, mode='a', header=False, index=False
+            )
+        self.pending = []
+        self.appended = 0
+        self.rewrite = False
+        self.version = usage_data.data_version(self.path)
+        self._save_index()
+
+    # delta가 커지면 (DELTA_COMPACT_ROWS 또는 base의 1/8 초과) base와 합쳐서 다시 씀, 아니면 delta만 씀
+    def _save_index(self):
+        os.makedirs(self.index_dir, exist_ok=True)
+        if not self.base_saved or len(self.delta[0]) > max(DELTA_COMPACT_ROWS, len(self.base[0]) // 8):
+            keys = np.concatenate([self.base[0], self.delta[0]])
+            order = np.argsort(keys, kind='stable')
+            self.base = tuple(np.concatenate([b, d])[order] for b, d in zip(self.base, self.delta))
+            self.delta = tuple(np.zeros(0, dtype=array.dtype) for array in self.base)
+            for name, array in zip(INDEX_ARRAYS, self.base):
+                tmp_path = self._index_file(f"base-{name}.{os.getpid()}.tmp.npy")
+                np.save(tmp_path, array)
+                os.replace(tmp_path, self._index_file(f"base-{name}.npy"))
+            self.base_saved = True
+
+        tmp_path = self._index_file(f"lookup.{os.getpid()}.tmp")
+        lookup = {col: values.to_dict() for col, values in self.lookup.items()}
+        lookup['trial_start_date'] = {org: date.isoformat() for org, date in lookup['trial_start_date'].items()}
+        with open(tmp_path, "w") as f:
+            json.dump(lookup, f)
+        os.replace(tmp_path, self._index_file("lookup.json"))
+
+        # delta를 마지막에 교체 (version / base_size가 맞을 때만 인덱스를 그대로 사용)
+        tmp_path = self._index_file(f"delta.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp_path, **dict(zip(INDEX_ARRAYS, self.delta)),
+            version=self.version, n_rows=self.n_rows, base_size=len(self.base[0]),
+        )
+        os.replace(tmp_path, self._index_file("delta.npz"))
+
+
+# 전 조직 유저 디렉터리 (이벤트 로그와 별도 테이블)
+# 활동 유저 / joined / invited 후보를 한 번에 모아 STATUS_PRIORITY 순으로 (organization, user_email) 중복 제거
+# → joined 중 활동 없는 유저 = joined_no_usage, joined/활동 모두 없는 invited = invited_not_joined
+# 시트가 없으면 이벤트 로그에 들어 있는 상태 행(joined_no_usage 등)을 후보로 사용
+def build_user_directory(events, joined=None, invited=None):
+    events = events.dropna(subset=['organization', 'user_email']).assign(
+        user_email=lambda df: normalize_email(df['user_email'])
+    )
+    has_event = events['status'].eq('active') & events['created_at'].notna()
+    activity = (
+        events[has_event]
+        .groupby(['organization', 'user_email'])
+        .agg(
+            user_name=('user_name', 'first'),
+            division=('division', 'first'),
+            earnings=('earnings', 'first'),
+            briefing=('briefing', 'first'),
+            first_seen=('created_at', 'min'),
+            last_seen=('created_at', 'max'),
+            events=('created_at', 'size'),
+        )
+        .reset_index()
+        .assign(status='active')
+    )
+
+    candidates = [activity, events.loc[~has_event & events['status'].ne('active')]]
+    if joined is not None:
+        candidates.append(joined.assign(status='joined_no_usage'))
+    if invited is not None:
+        candidates.append(invited.assign(status='invited_not_joined'))
+
+    columns = ['organization', 'user_email', 'user_name', 'status', 'division', 'earnings', 'briefing']
+    candidates = pd.concat(
+        [df.reindex(columns=columns + ['first_seen', 'last_seen', 'events']) for df in candidates],
+        ignore_index=True,
+    ).dropna(subset=['organization', 'user_email'])
+    candidates['user_email'] = normalize_email(candidates['user_email'])
+    candidates['status'] = pd.Categorical(candidates['status'], categories=STATUS_PRIORITY, ordered=True)
+    candidates = candidates.dropna(subset=['status']).sort_values('status', kind='stable')
+
+    # 이름/division/earnings/briefing은 어느 소스에서든 처음 나온 값으로 보강
+    attributes = candidates.groupby(['organization', 'user_email'])[
+        ['user_name', 'division', 'earnings', 'briefing']
+    ].first()
+    directory = (
+        candidates.drop_duplicates(['organization', 'user_email'])
+        .drop(columns=['user_name', 'division', 'earnings', 'briefing'])
+        .join(attributes, on=['organization', 'user_email'])
+    )
+    directory['status'] = directory['status'].astype(str)
+    directory['events'] = directory['events'].fillna(0).astype(int)
+    return directory[DIRECTORY_COLUMNS].sort_values(['organization', 'user_email']).reset_index(drop=True)
+
+
+# as_of 시점의 디렉터리: as_of 이후 첫 사용 유저는 아직 사용 전 (joined_no_usage)
+# first_seen / last_seen도 as_of 이후 값은 지움 (as_of 이전 마지막 사용일은 디렉터리에 없음, events는 전체 기간 기준)
+def directory_as_of(directory, as_of):
+    cutoff = pd.Timestamp(as_of).normalize() + pd.Timedelta(days=1)
+    not_yet = directory['status'].eq('active') & (directory['first_seen'] >= cutoff)
+    return directory.assign(
+        status=directory['status'].mask(not_yet, 'joined_no_usage'),
+        first_seen=directory['first_seen'].mask(not_yet),
+        last_seen=directory['last_seen'].mask(directory['last_seen'] >= cutoff),
+    )
+
+
+def load_directory():
+    if not os.path.exists(USER_DIRECTORY_PATH):
+        return None
+    return pd.read_csv(USER_DIRECTORY_PATH, parse_dates=['first_seen', 'last_seen'])
+
+
+# 기존 디렉터리에 변경 행의 활동만 병합 (users.xlsx / 전체 이벤트를 다시 읽지 않음)
+# 이벤트 수는 추가 행 - 교체 전 행, first_seen / last_seen은 min / max, 상태는 STATUS_PRIORITY 앞쪽 우선
+# 교체 전 행의 created_at이 최소/최대였던 경우는 python ingest.py 전체 재생성 때 반영
+def merge_user_directory(directory, added, removed):
+    removed = build_user_directory(removed)
+    candidates = pd.concat([
+        directory,
+        build_user_directory(added),
+        removed[['organization', 'user_email']].assign(events=-removed['events']),
+    ], ignore_index=True)
+    candidates['status'] = pd.Categorical(candidates['status'], categories=STATUS_PRIORITY, ordered=True)
+    directory = candidates.groupby(['organization', 'user_email']).agg(
+        user_name=('user_name', 'first'),
+        status=('status', 'min'),
+        division=('division', 'first'),
+        earnings=('earnings', 'first'),
+        briefing=('briefing', 'first'),
+        first_seen=('first_seen', 'min'),
+        last_seen=('last_seen', 'max'),
+        events=('events', 'sum'),
+    ).reset_index()
+    directory['status'] = directory['status'].astype(str)
+    directory['events'] = directory['events'].astype(int)
+    return directory[DIRECTORY_COLUMNS]
+
+
+# 새 데이터 버전의 파생 스냅샷 - df_all.csv를 다시 파싱하지 않고 이전 버전 스냅샷 + 변경 행으로 갱신
+# - 이벤트 스냅샷: 추가만 있으면 이전 스냅샷 + 새 행 (정렬만 다시), 기존 행이 바뀌었으면 메모리의 store.events로 계산
+# - 시간 단위 집계 / ROI ledger: 이전 버전 스냅샷에 변경 행만 반영 (이전 스냅샷이 없으면 전체 계산)
+# - 유저 디렉터리: user_directory.csv에 변경 행의 유저만 병합 (파일이 없으면 전체 생성)
+def update_snapshots(store, before, added, removed):
+    added, removed = usage_data.prepare_events(added), usage_data.prepare_events(removed)
+    previous = usage_data.events_snapshot_path(before)
+    if len(removed):
+        snapshot = usage_data.prepare_events(store.events)
+        usage_data.write_snapshot(snapshot, usage_data.events_snapshot_path(store.version))
+    elif before is not None and os.path.exists(previous):
+        snapshot = pd.concat([pd.read_parquet(previous), added], ignore_index=True)
+        snapshot = snapshot.sort_values(['organization', 'created_at'], kind='stable').reset_index(drop=True)
+        usage_data.write_snapshot(snapshot, usage_data.events_snapshot_path(store.version))
+    else:
+        snapshot = usage_data.load_snapshot(store.path)  # 이전 스냅샷이 없으면 CSV에서 한 번 생성
+
+    previous = latency.hourly_snapshot_path(before)
+    if before is not None and os.path.exists(previous):
+        sketch = latency.LatencySketch(pd.read_parquet(previous).set_index(latency.SKETCH_KEYS))
+        sketch.add(usage_data.response_times(added))
+        sketch.add(usage_data.response_times(removed), weight=-1)
+    else:
+        sketch = latency.build_latency_sketch(usage_data.response_times(snapshot))
+    usage_data.write_snapshot(sketch.counts.reset_index(), latency.hourly_snapshot_path(store.version))
+
+    model = time_saved.load_model()
+    previous = time_saved.ledger_snapshot_path(before, model)
+    if before is not None and os.path.exists(previous):
+        ledger = time_saved.update_ledger(pd.read_parquet(previous), added, removed, model)
+    else:
+        ledger = time_saved.build_ledger(snapshot, model)
+    usage_data.write_snapshot(ledger, time_saved.ledger_snapshot_path(store.version, model))
+
+    directory = load_directory()
+    if directory is None:
+        rebuild_user_directory(snapshot)
+    else:
+        merge_user_directory(directory, added, removed).to_csv(USER_DIRECTORY_PATH, index=False)
+    return snapshot
+
+
+# export 파일들을 이벤트 저장소에 upsert → 데이터 버전이 바뀌면 파생 스냅샷 갱신
+# skip_errors: 읽을 수 없는 파일(깨진 xlsx, 열 누락 등)은 오류만 출력하고 나머지 파일 계속 처리
+# 반환: 새 버전 이벤트 스냅샷 (df_all.csv가 그대로면 None)
+def ingest_exports(paths, store=None, skip_errors=False):
+    store = store or EventStore()
+    before = store.version
+    directory = load_directory()
+    for path in paths:
+        try:
+            new = enrich_events(read_export(path), store.lookup, directory)
+        except Exception as error:
+            if not skip_errors:
+                raise
+            print(f"[{path}] skipped: {type(error).__name__}: {error}")
+            continue
+        inserted, updated = store.upsert(new)
+        print(f"[{path}] {inserted} inserted, {updated} updated")
+    store.save()
+    added, removed = store.take_changes()
+    if store.version == before:
+        return None
+    return update_snapshots(store, before, added, removed)
+
+
+def rebuild_user_directory(events=None):
+    joined, invited = read_user_sheets()
+    events = usage_data.load_snapshot() if events is None else events
+    directory = build_user_directory(events, joined, invited)
+    directory.to_csv(USER_DIRECTORY_PATH, index=False)
+    return directory
+
+
+# 사용법: python ingest.py [messages0723.xlsx catalyst0723.xlsx ...]
+# export 파일을 upsert한 뒤 유저 디렉터리 재생성
+if __name__ == "__main__":
+    if sys.argv[1:]:
+        ingest_exports(sys.argv[1:])
+    directory = rebuild_user_directory()
+    print(directory.groupby(['organization', 'status']).size().unstack(fill_value=0))
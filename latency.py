@@ -0,0 +1,182 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import usage_data
+
+
+# 로그 간격 히스토그램 버킷 (초): 0.05s ~ 300s, 버킷 폭 5% → 분위수 상대 오차 약 2.5% 이내
+MIN_SECONDS = 0.05
+MAX_SECONDS = 300
+GAMMA = 1.05
+N_BUCKETS = int(np.ceil(np.log(MAX_SECONDS / MIN_SECONDS) / np.log(GAMMA))) + 1
+# 버킷 대표값 = 버킷 경계의 기하 평균
+BUCKET_VALUES = MIN_SECONDS * GAMMA ** (np.arange(N_BUCKETS) + 0.5)
+SKETCH_KEYS = ['hour', 'agent_type', 'organization']
+BUCKET_COLUMNS = [f"b{i}" for i in range(N_BUCKETS)]
+SKETCH_FORMAT = 1
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def bucket_index(seconds):
+    index = np.floor(np.log(np.maximum(seconds, MIN_SECONDS) / MIN_SECONDS) / np.log(GAMMA))
+    return np.clip(index, 0, N_BUCKETS - 1).astype(np.int64)
+
+
+# 히스토그램 행렬(행 = 구간) → 분위수 (해당 구간에 TTFB가 없으면 NaN)
+def _bucket_quantile(buckets, q):
+    cumulative = buckets.cumsum(axis=1)
+    total = cumulative[:, -1]
+    rank = (cumulative < (q * total)[:, None]).sum(axis=1)
+    return np.where(total > 0, BUCKET_VALUES[np.minimum(rank, N_BUCKETS - 1)], np.nan)
+
+
+# (시간 × agent_type × 조직)별 이벤트 수 + TTFB 히스토그램
+# 원본 행 대신 이 시간 단위 집계만으로 분위수 / 부하 계산
+# 같은 키로 add하면 카운트가 합쳐지므로 새 데이터만 추가로 넣으면 됨 (weight=-1이면 해당 행을 뺌)
+class LatencySketch:
+    def __init__(self, counts=None):
+        if counts is None:
+            counts = pd.DataFrame(
+                np.zeros((0, N_BUCKETS + 1), dtype=np.int64),
+                columns=['events'] + BUCKET_COLUMNS,
+                index=pd.MultiIndex.from_tuples([], names=SKETCH_KEYS),
+            )
+        self.counts = counts
+
+    # time_to_first_byte는 이상치 제거 + 초 단위로 변환된 값 기준 (usage_data.response_times)
+    # 이벤트 수는 TTFB가 없는 요청(catalysts 등)도 포함
+    def add(self, df, weight=1):
+        valid = df[df['created_at'].notna()]
+        if valid.empty:
+            return
+        keys = pd.DataFrame({
+            'hour': valid['created_at'].dt.floor('h'),
+            'agent_type': valid['agent_type'].fillna('unknown'),
+            'organization': valid['organization'].fillna('unknown'),
+        })
+        codes, uniques = pd.MultiIndex.from_frame(keys).factorize()
+        block = np.zeros((len(uniques), N_BUCKETS + 1), dtype=np.int64)
+        np.add.at(block[:, 0], codes, weight)
+        ttfb = valid['time_to_first_byte'].to_numpy()
+        timed = ~np.isnan(ttfb)
+        np.add.at(block, (codes[timed], 1 + bucket_index(ttfb[timed])), weight)
+        block = pd.DataFrame(
+            block,
+            columns=self.counts.columns,
+            index=pd.MultiIndex.from_tuples(uniques, names=SKETCH_KEYS),
+        )
+        counts = pd.concat([self.counts, block]).groupby(level=SKETCH_KEYS).sum()
+        self.counts = counts[counts['events'] != 0]
+
+    # 기간 / 조직 / 기능 조건에 맞는 행만
+    def _select(self, start_date=None, end_date=None, organization=None, agent_type=None):
+        counts = self.counts
+        hours = counts.index.get_level_values('hour')
+        mask = np.ones(len(counts), dtype=bool)
+        if start_date is not None:
+            mask &= hours >= pd.Timestamp(start_date)
+        if end_date is not None:
+            mask &= hours < pd.Timestamp(end_date) + pd.Timedelta(days=1)
+        if organization is not None:
+            mask &= counts.index.get_level_values('organization') == organization
+        if agent_type is not None:
+            mask &= counts.index.get_level_values('agent_type') == agent_type
+        return counts[mask]
+
+    # freq('D' / 'h') × by(None / 'agent_type' / 'organization') 단위 p50 / p95 / 건수
+    # (TTFB가 있는 구간만)
+    def quantiles(self, freq='D', by=None, start_date=None, end_date=None):
+        counts = self._select(start_date, end_date)
+        keys = [counts.index.get_level_values('hour').floor(freq).rename('period')]
+        if by is not None:
+            keys.append(counts.index.get_level_values(by))
+        merged = counts.groupby(keys).sum()
+        buckets = merged[BUCKET_COLUMNS].to_numpy()
+        stats = pd.DataFrame({
+            'count': buckets.sum(axis=1),
+            'p50': _bucket_quantile(buckets, 0.5),
+            'p95': _bucket_quantile(buckets, 0.95),
+        }, index=merged.index)
+        return stats[stats['count'] > 0].reset_index()
+
+    # 시간대(0~23시) × 요일(rows='weekday') 또는 × 날짜(rows='day') 이벤트 수 / TTFB p95 행렬
+    # tz: 표시 기준 시간대 (원본 created_at은 UTC)
+    def heatmap(self, rows='weekday', tz='UTC', start_date=None, end_date=None, organization=None, agent_type=None):
+        counts = self._select(start_date, end_date, organization, agent_type)
+        hours = counts.index.get_level_values('hour').tz_localize('UTC').tz_convert(tz).tz_localize(None)
+        row_key = hours.dayofweek if rows == 'weekday' else hours.normalize()
+        merged = counts.groupby([row_key.rename(rows), hours.hour.rename('hour')]).sum()
+
+        events = merged['events'].unstack('hour', fill_value=0)
+        p95 = pd.Series(_bucket_quantile(merged[BUCKET_COLUMNS].to_numpy(), 0.95), index=merged.index)
+        p95 = p95.unstack('hour')
+        row_index = range(7) if rows == 'weekday' else events.index
+        events = events.reindex(index=row_index, columns=range(24), fill_value=0)
+        p95 = p95.reindex(index=row_index, columns=range(24))
+        if rows == 'weekday':
+            events.index = p95.index = pd.Index(WEEKDAYS, name=rows)
+        return events, p95
+
+
+def build_latency_sketch(df_time):
+    sketch = LatencySketch()
+    sketch.add(df_time)
+    return sketch
+
+
+def hourly_snapshot_path(version, snapshot_dir=usage_data.SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f"hourly-{version}-v{SKETCH_FORMAT}.parquet")
+
+
+# 데이터 버전별 시간 단위 집계 스냅샷 - ingest 직후 만들어 두고 대시보드는 읽기만 함
+def load_hourly_sketch(path=usage_data.DATA_PATH, snapshot_dir=usage_data.SNAPSHOT_DIR):
+    snapshot_path = hourly_snapshot_path(usage_data.data_version(path), snapshot_dir)
+    if os.path.exists(snapshot_path):
+        return LatencySketch(pd.read_parquet(snapshot_path).set_index(SKETCH_KEYS))
+
+    sketch = build_latency_sketch(usage_data.response_times(usage_data.load_snapshot(path, snapshot_dir)))
+    usage_data.write_snapshot(sketch.counts.reset_index(), snapshot_path)
+    return sketch
+
+
+def _mad(values):
+    return np.nanmedian(np.abs(values - np.nanmedian(values)))
+
+
+# 직전 window개 구간(freq 단위 시간)의 median / MAD (현재 구간은 기준선에 포함하지 않음)
+# quantiles()는 이벤트가 없는 구간을 빼므로 빈 구간까지 채운 시간 격자 위에서 rolling
+def _rolling_baseline(values, periods, window, freq):
+    series = pd.Series(values.to_numpy(), index=pd.DatetimeIndex(periods))
+    grid = pd.date_range(series.index.min(), series.index.max(), freq=freq)
+    history = series.reindex(grid).shift(1).rolling(window, min_periods=max(window // 2, 3))
+    median = history.median().reindex(series.index).set_axis(values.index)
+    mad = history.apply(_mad, raw=True).reindex(series.index).set_axis(values.index)
+    return median, mad
+
+
+# 그룹별 rolling 기준선 대비 급등한 구간 표시 (freq: stats를 만든 quantiles()의 구간 단위)
+# - robust z = (값 - median) / (1.4826 × MAD) > threshold
+# - 기준선 대비 min_ratio배 이상, 건수 min_count 이상인 구간만 (소량 구간 노이즈 제외)
+def detect_anomalies(stats, metric='p95', by=None, freq='D', window=14, threshold=3.5, min_ratio=1.2, min_count=10):
+    stats = stats.sort_values(([by] if by else []) + ['period']).copy()
+    if stats.empty:
+        return stats.assign(baseline=np.nan, score=np.nan, anomaly=False)
+    # 건수가 적은 구간은 기준선 계산에서도 제외
+    reliable = stats[metric].where(stats['count'] >= min_count)
+    groups = reliable.groupby(stats[by], sort=False) if by else [(None, reliable)]
+    baselines = [_rolling_baseline(values, stats.loc[values.index, 'period'], window, freq) for _, values in groups]
+    baseline = pd.concat([median for median, _ in baselines])
+    mad = pd.concat([mad for _, mad in baselines])
+
+    # MAD가 0이면 (값이 거의 같았던 구간) 버킷 폭만큼을 최소 스케일로 사용
+    scale = (1.4826 * mad).clip(lower=baseline * (GAMMA - 1))
+    stats['baseline'] = baseline
+    stats['score'] = (stats[metric] - baseline) / scale
+    stats['anomaly'] = (
+        (stats['score'] > threshold)
+        & (stats[metric] >= baseline * min_ratio)
+        & (stats['count'] >= min_count)
+    )
+    return stats
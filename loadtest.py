@@ -0,0 +1,243 @@
+import argparse
+import os
+import random
+import resource
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import ingest
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Main.py")
+
+# 실제 df_all.csv 비율을 흉내낸 기능 / 모델 분포
+FUNCTION_MODES = {
+    'normal': 0.76, 'deep_research': 0.11, 'catalysts': 0.02, 'primer': 0.02, 'call_summarize': 0.02,
+    'structured_data': 0.015, 'meeting_agent': 0.015, 'individual_summary': 0.01, 'company_screener': 0.01,
+    'pulse_check': 0.01, 'ownership_data': 0.01,
+}
+MODELS = {'integrate_search': 0.77, 'reasoning_r1': 0.12, 'rms': 0.08, 'linq_alpha': 0.02, 'news': 0.01}
+# UTC 기준 시간대별 요청 비중 (아시아 오전 + 미국 오후에 몰림)
+HOUR_WEIGHTS = np.array([6, 8, 8, 7, 6, 5, 4, 3, 2, 2, 2, 2, 3, 4, 6, 7, 6, 5, 3, 2, 2, 2, 3, 4], dtype=float)
+
+
+# df_all.csv와 같은 구조의 합성 이벤트 로그 (조직별 유저, trial 시작일, 상태 행 포함)
+def build_synthetic_dataset(as_of, n_orgs=12, users_per_org=20, days=120, events_per_day=60, seed=0):
+    rng = np.random.default_rng(seed)
+    as_of = pd.Timestamp(as_of).normalize()
+    orgs = [f"Org {i:02d}" for i in range(1, n_orgs + 1)]
+    # 조직별 사용량은 Zipf 형태로 편중
+    org_weights = 1 / np.arange(1, n_orgs + 1)
+    org_weights /= org_weights.sum()
+    trial_start = {org: as_of - pd.Timedelta(days=int(rng.integers(14, days))) for org in orgs}
+
+    n_events = days * events_per_day
+    org_index = rng.choice(n_orgs, n_events, p=org_weights)
+    user_index = rng.zipf(1.6, n_events) % users_per_org
+    day_offset = rng.integers(0, days, n_events)
+    hour = rng.choice(24, n_events, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+    created_at = (
+        as_of - pd.to_timedelta(day_offset, unit='D')
+        + pd.to_timedelta(hour, unit='h')
+        + pd.to_timedelta(rng.integers(0, 3600 * 1000, n_events), unit='ms')
+    )
+    function_mode = rng.choice(list(FUNCTION_MODES), n_events, p=np.array(list(FUNCTION_MODES.values())) / sum(FUNCTION_MODES.values()))
+    ttfb = np.round(rng.lognormal(np.log(15000), 0.8, n_events))
+    ttfb[(function_mode == 'catalysts') | (rng.random(n_events) < 0.05)] = np.nan
+
+    events = pd.DataFrame({
+        'id': [f"{i:08x}-0000-4000-8000-{i:012x}" for i in range(n_events)],
+        'selected_model': rng.choice(list(MODELS), n_events, p=list(MODELS.values())),
+        'sender': 'user',
+        'function_mode': function_mode,
+        'user_name': [f"User {o + 1:02d}-{u:02d}" for o, u in zip(org_index, user_index)],
+        'user_email': [f"user{u:02d}@org{o + 1:02d}.example.com" for o, u in zip(org_index, user_index)],
+        'user_group': np.where(rng.random(n_events) < 0.8, 'general', 'test_feature'),
+        'organization': np.array(orgs)[org_index],
+        'time_to_first_byte': ttfb,
+        'created_at': created_at,
+        'status': 'active',
+    })
+    events.loc[events['function_mode'] == 'catalysts', 'id'] = np.nan
+    events = events[events['created_at'] >= events['organization'].map(trial_start)]
+
+    # 초대만 받은 유저 / 가입만 한 유저 상태 행 (created_at 없음)
+    placeholders = pd.DataFrame([
+        {
+            'organization': org, 'user_name': f"User {i + 1:02d}-{users_per_org + j:02d}",
+            'user_email': f"user{users_per_org + j:02d}@org{i + 1:02d}.example.com", 'status': status,
+        }
+        for i, org in enumerate(orgs)
+        for j, status in enumerate(['invited_not_joined', 'joined_no_usage'])
+    ])
+    df = pd.concat([events, placeholders], ignore_index=True)
+    df['trial_start_date'] = df['organization'].map(trial_start).dt.date
+    df['division'] = np.where(df['user_email'].str.contains(r'user0[0-4]@'), 'Research', None)
+    df['earnings'] = np.where(df['user_email'].str.contains(r'user0[0-9]@'), 'onboarded', None)
+    df['briefing'] = np.where(df['user_email'].str.contains(r'user1[0-9]@'), 'onboarded', None)
+    df['created_at'] = df['created_at'].dt.strftime('%Y-%m-%d %H:%M:%S.%f').str[:-3]
+    return df[ingest.EVENT_COLUMNS].sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+# 현재 프로세스 RSS (MB) - /proc이 없으면 최대 RSS로 대체
+def rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except FileNotFoundError:
+        pass
+    return peak_rss_mb()
+
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# 분석가 한 명의 상호작용 시나리오: (단계 이름, 위젯 조작) - 각 단계가 rerun 한 번
+def session_script(rng):
+    def switch_org(at):
+        org = at.selectbox[0]
+        return org.select(rng.choice(org.options))
+
+    def view_mode(index):
+        def toggle(at):
+            radio = at.radio(key="function_trends_view_mode")
+            return radio.set_value(radio.options[index])
+        return toggle
+
+    def select_all_users(at):
+        return next(button for button in at.button if button.label == "✅ 전체 선택").click()
+
+    def pick_date(at):
+        dates = next(sb for sb in at.selectbox if sb.label.startswith("Select a date"))
+        return dates.select(rng.choice(dates.options[1:] or dates.options))
+
+    return [
+        ("switch_org", switch_org),
+        ("trial_view", view_mode(1)),
+        ("select_all_users", select_all_users),
+        ("pick_date", pick_date),
+        ("recent_view", view_mode(0)),
+    ]
+
+
+# 세션 하나: 첫 로딩 후 시나리오를 rounds번 반복하며 rerun별 소요 시간 기록
+def run_session(session_id, as_of, rounds, timeout, results, errors):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(session_id)
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.query_params["as_of"] = as_of
+    steps = [("initial", None)] + session_script(rng) * rounds
+    for name, action in steps:
+        start = time.perf_counter()
+        try:
+            (at if action is None else action(at)).run()
+        except Exception as exc:  # 위젯이 없어지는 등 시나리오 실패도 결과에 기록
+            errors.append((session_id, name, repr(exc)))
+            return
+        results.append((session_id, name, time.perf_counter() - start))
+        if at.exception:
+            errors.append((session_id, name, at.exception[0].value))
+            return
+
+
+# 동시 세션 N개 실행 → rerun 지연 분위수 / 처리량 / 메모리
+def run_level(n_sessions, as_of, rounds, timeout):
+    results, errors = [], []
+    threads = [
+        threading.Thread(target=run_session, args=(i, as_of, rounds, timeout, results, errors))
+        for i in range(n_sessions)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([latency for _, _, latency in results])
+    summary = {
+        'sessions': n_sessions,
+        'reruns': len(latencies),
+        'errors': len(errors),
+        'p50_s': np.percentile(latencies, 50) if len(latencies) else np.nan,
+        'p95_s': np.percentile(latencies, 95) if len(latencies) else np.nan,
+        'p99_s': np.percentile(latencies, 99) if len(latencies) else np.nan,
+        'max_s': latencies.max() if len(latencies) else np.nan,
+        'reruns_per_s': len(latencies) / elapsed,
+        'rss_mb': rss_mb(),
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    steps = pd.DataFrame(results, columns=['session', 'step', 'latency']).assign(sessions=n_sessions)
+    return summary, steps, errors
+
+
+# 캐시가 빈 상태의 첫 로딩 (cold start) 측정 후 세션 수를 늘려가며 반복
+def run_levels(args):
+    cold_summary, _, cold_errors = run_level(1, args.as_of, 0, args.timeout)
+    print(f"cold start: {cold_summary['max_s']:.2f}s, rss {cold_summary['rss_mb']:.0f} MB")
+    for error in cold_errors:
+        print("  error:", error)
+
+    summaries, all_steps = [], []
+    for n_sessions in args.sessions:
+        summary, steps, errors = run_level(n_sessions, args.as_of, args.rounds, args.timeout)
+        summaries.append(summary)
+        all_steps.append(steps)
+        for error in errors[:5]:
+            print("  error:", error)
+
+    print(pd.DataFrame(summaries).round(2).to_string(index=False))
+    steps = pd.concat(all_steps, ignore_index=True)
+    print("\np95 latency by step (s)")
+    print(steps.pivot_table(
+        index='step', columns='sessions', values='latency', aggfunc=lambda s: s.quantile(0.95)
+    ).round(2).to_string())
+    if args.csv:
+        steps.to_csv(args.csv, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive concurrent simulated sessions through Main.py on a synthetic dataset.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8], help="concurrent session counts to test")
+    parser.add_argument("--rounds", type=int, default=2, help="interaction script repetitions per session")
+    parser.add_argument("--as-of", default="2025-08-01")
+    parser.add_argument("--orgs", type=int, default=12)
+    parser.add_argument("--users-per-org", type=int, default=20)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--events-per-day", type=int, default=60)
+    parser.add_argument("--timeout", type=float, default=300, help="per-rerun timeout in seconds")
+    parser.add_argument("--csv", help="write per-rerun latencies to this file")
+    parser.add_argument("--keep", action="store_true", help="keep the synthetic dataset folder")
+    args = parser.parse_args()
+    if args.csv:
+        args.csv = os.path.abspath(args.csv)
+
+    # 합성 데이터가 있는 임시 폴더에서 앱 실행 (상대 경로 df_all.csv / .cache / 공유 테이블 모두 격리)
+    workdir = tempfile.mkdtemp(prefix="dashboard-loadtest-")
+    os.environ["DASHBOARD_SHARED_DIR"] = os.path.join(workdir, "shared")
+    df = build_synthetic_dataset(
+        args.as_of, args.orgs, args.users_per_org, args.days, args.events_per_day
+    )
+    df.to_csv(os.path.join(workdir, "df_all.csv"), index=False)
+    print(f"synthetic dataset: {len(df)} rows, {args.orgs} orgs -> {workdir}")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        run_levels(args)
+    finally:
+        os.chdir(cwd)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
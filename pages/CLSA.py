@@ -1,37 +1,24 @@
 import streamlit as st
-import pandas as pd
+
+import usage_data
+from dashboard_utils import as_of_control, download_buttons, load_dataset, pivot_with_totals
 
 st.set_page_config(page_title="CLSA", page_icon="��", layout="wide")
 
 
 
-# 데이터 로딩 및 전처리
-df_all = pd.read_csv("df_all.csv", parse_dates=["created_at"])
+# 📅 기준 날짜 (as_of)
+as_of = as_of_control()
+
+# 데이터 로딩 및 전처리 (as_of 시점 스냅샷, 주차 버킷 포함)
+df_all = load_dataset(as_of, usage_data.data_version())
 df_clsa = df_all[df_all["organization"] == "CLSA"].copy()
 
 # 📌 파생 컬럼
 df_clsa["function_mode"] = df_clsa["function_mode"].fillna("unknown")
 df_clsa["user_name"] = df_clsa["user_name"].fillna("unknown")
 df_clsa["created_date"] = df_clsa["created_at"].dt.date
-
-# 📅 기준 날짜: 오늘 정오
-now = pd.Timestamp.now().normalize() + pd.Timedelta(hours=12)
-
-# 📅 주차 버킷 설정
-week_ranges = {
-    "week4": (now - pd.Timedelta(days=6), now),
-    "week3": (now - pd.Timedelta(days=13), now - pd.Timedelta(days=7)),
-    "week2": (now - pd.Timedelta(days=20), now - pd.Timedelta(days=14)),
-    "week1": (now - pd.Timedelta(days=27), now - pd.Timedelta(days=21)),
-}
-
-def assign_week(date):
-    for week, (start, end) in week_ranges.items():
-        if start <= date <= end:
-            return week
-    return None
-
-df_clsa["week"] = df_clsa["created_at"].apply(assign_week)
+df_clsa["week"] = df_clsa["week_bucket"]
 
 # ✅ division 선택
 st.title("🏢 CLSA Function Usage Summary")
@@ -59,23 +46,15 @@ selected_users = st.multiselect(
 # ✅ 선택된 유저 데이터
 df_filtered = df_div[df_div["user_name"].isin(selected_users)].copy()
 
-# 📊 피벗 테이블 생성
-pivot_df = (
-    df_filtered.groupby(["function_mode", "week"])
-    .size()
-    .reset_index(name="count")
-    .pivot_table(index="function_mode", columns="week", values="count", fill_value=0)
+# 📊 기능 × 주차 테이블 (week1~week4 순서, 없는 주차는 0) + Total
+pivot_df = pivot_with_totals(
+    df_filtered[["function_mode", "week"]],
+    index="function_mode",
+    columns="week",
+    column_order=["week1", "week2", "week3", "week4"]
 )
 
-# ✅ 열 순서 정리 및 Total 열 추가
-ordered_cols = ["week1", "week2", "week3", "week4"]
-for w in ordered_cols:
-    if w not in pivot_df.columns:
-        pivot_df[w] = 0
-pivot_df = pivot_df[ordered_cols]
-pivot_df["Total"] = pivot_df.sum(axis=1)
-pivot_df.loc["Total"] = pivot_df.sum(numeric_only=True)
-
 # ✅ 출력
 st.markdown("### 📋 Weekly Function Usage Table")
-st.dataframe(pivot_df.astype(int), use_container_width=True)
+st.dataframe(pivot_df, use_container_width=True)
+download_buttons(pivot_df, f"CLSA_{selected_div}_weekly_functions_{as_of}", key="export_clsa_weekly")
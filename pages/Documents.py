@@ -0,0 +1,117 @@
+import streamlit as st
+import plotly.express as px
+from plotly.subplots import make_subplots
+import plotly.graph_objects as go
+
+import documents
+import usage_data
+from dashboard_utils import as_of_control, document_version, download_buttons, load_dataset, load_document_summary
+
+st.set_page_config(page_title="Documents", page_icon="📄", layout="wide")
+
+
+# 📅 기준 날짜 (as_of) - TTFB 비교 구간 끝
+as_of = as_of_control()
+
+st.title("📄 Document Pipeline Health")
+
+# 원본 엑셀 대신 버전별 집계 스냅샷 사용 (일 × provider × doc_type × 실패 사유)
+with st.spinner("Loading document summary..."):
+    summary = load_document_summary(document_version())
+
+# ✅ provider / doc_type 필터
+col1, col2 = st.columns(2)
+with col1:
+    providers = sorted(summary["provider"].unique())
+    selected_providers = st.multiselect("Provider", providers, default=providers, key="documents_provider")
+with col2:
+    doc_types = sorted(summary["doc_type"].unique())
+    selected_doc_types = st.multiselect("Doc Type", doc_types, default=doc_types, key="documents_doc_type")
+
+summary = summary[summary["provider"].isin(selected_providers) & summary["doc_type"].isin(selected_doc_types)]
+if summary.empty:
+    st.info("No documents for the selected filters.")
+    st.stop()
+
+# 📌 주요 지표
+totals = summary[documents.COUNT_COLUMNS].sum()
+col1, col2, col3, col4, col5 = st.columns(5)
+with col1:
+    st.metric("Documents", f"{totals['documents']:,}")
+with col2:
+    st.metric("Parsed", f"{totals['parsed'] / totals['documents'] * 100:.1f}%")
+with col3:
+    st.metric("Embedded", f"{totals['embedded'] / totals['documents'] * 100:.1f}%")
+with col4:
+    st.metric("Failed", f"{totals['embed_failed'] + totals['parse_failed']:,}")
+with col5:
+    st.metric("Backlog", f"{totals['documents'] - totals['resolved']:,}")
+
+# 📋 provider × doc_type 성공률
+st.markdown("### 📋 Success Rates by Provider / Doc Type")
+success = documents.success_rates(summary, ["provider", "doc_type"])
+st.dataframe(success, use_container_width=True)
+download_buttons(success, "document_success_rates", key="export_document_success")
+
+# ❌ 실패 사유
+st.markdown("### ❌ Failure Reasons")
+failures = (
+    summary.dropna(subset=["failure_reason"])
+    .groupby(["failure_reason", "provider", "doc_type"])["documents"].sum()
+    .sort_values(ascending=False)
+    .reset_index(name="count")
+)
+if failures.empty:
+    st.info("No failed documents.")
+else:
+    st.dataframe(failures, use_container_width=True, hide_index=True)
+    download_buttons(failures, "document_failures", key="export_document_failures")
+
+# 📈 일별 생성/처리 건수 + 누적 backlog
+st.markdown("### 📈 Ingestion & Backlog Over Time")
+daily = documents.daily_backlog(summary)
+fig_daily = px.bar(
+    daily.melt(id_vars="day", value_vars=["documents", "resolved"], var_name="series", value_name="count"),
+    x="day", y="count", color="series", barmode="group",
+    labels={"day": "Date", "count": "Documents", "series": ""},
+    title="Documents Created vs Resolved per Day",
+)
+fig_daily.update_layout(height=350, hovermode="x unified")
+st.plotly_chart(fig_daily, use_container_width=True)
+
+breakdown = st.radio("Backlog breakdown", ["provider", "doc_type"], horizontal=True, key="documents_backlog_by")
+fig_backlog = px.area(
+    documents.daily_backlog(summary, breakdown),
+    x="day", y="backlog", color=breakdown,
+    labels={"day": "Date", "backlog": "Pending Documents"},
+    title=f"Backlog by {breakdown}",
+)
+fig_backlog.update_layout(height=350, hovermode="x unified")
+st.plotly_chart(fig_backlog, use_container_width=True)
+
+# ⏱️ backlog vs 응답 속도 (Main의 Response Time Analysis와 같은 TTFB 기준)
+st.markdown("### ⏱️ Backlog vs Response Time")
+df_time = usage_data.response_times(load_dataset(as_of, usage_data.data_version()))
+ttfb = (
+    df_time.dropna(subset=["time_to_first_byte"])
+    .groupby(df_time["created_at"].dt.normalize())["time_to_first_byte"]
+    .agg(median="median", p95=lambda s: s.quantile(0.95))
+)
+overlap = daily.set_index("day").join(ttfb, how="inner")
+if overlap.empty:
+    st.info("No overlapping dates between the document export and response time data.")
+else:
+    fig_corr = make_subplots(specs=[[{"secondary_y": True}]])
+    fig_corr.add_trace(go.Scatter(x=overlap.index, y=overlap["backlog"], name="Backlog", fill="tozeroy"))
+    fig_corr.add_trace(go.Scatter(x=overlap.index, y=overlap["median"], name="Median TTFB (sec)"), secondary_y=True)
+    fig_corr.add_trace(go.Scatter(x=overlap.index, y=overlap["p95"], name="P95 TTFB (sec)"), secondary_y=True)
+    fig_corr.update_yaxes(title_text="Pending Documents", secondary_y=False)
+    fig_corr.update_yaxes(title_text="Response Time (seconds)", secondary_y=True)
+    fig_corr.update_layout(height=400, hovermode="x unified")
+    st.plotly_chart(fig_corr, use_container_width=True)
+
+    corr = overlap[["backlog", "median", "p95"]].corr().loc["backlog", ["median", "p95"]]
+    st.caption(
+        f"Correlation with backlog over {len(overlap)} days — "
+        f"median TTFB: {corr['median']:.2f}, P95 TTFB: {corr['p95']:.2f}"
+    )
@@ -0,0 +1,130 @@
+import streamlit as st
+import plotly.express as px
+
+import hierarchy
+import usage_data
+from dashboard_utils import as_of_control, download_buttons, load_hierarchy, pivot_body, pivot_with_totals
+
+st.set_page_config(page_title="Hierarchy", page_icon="🏢", layout="wide")
+
+
+# 📅 기준 날짜 (as_of)
+as_of = as_of_control()
+
+st.title("🏢 Organization Hierarchy")
+
+# 단계별 롤업은 as_of + 데이터 버전당 한 번 계산 (조직 → division → department → 유저)
+with st.spinner("Loading hierarchy..."):
+    rollups = load_hierarchy(as_of, usage_data.data_version())
+levels = rollups.levels
+
+
+# 하위 단계가 "(unassigned)" 하나뿐이면 (division이 없는 조직 등) 그 단계를 건너뜀
+def descend(path):
+    path = list(path)
+    while len(path) < len(levels) - 1 and rollups.children(path).index.tolist() == [hierarchy.UNASSIGNED]:
+        path.append(hierarchy.UNASSIGNED)
+    return path
+
+
+def drill_down():
+    child = st.session_state.hierarchy_drill
+    if child is not None:
+        st.session_state.hierarchy_path = descend(st.session_state.hierarchy_path + [child])
+    st.session_state.hierarchy_drill = None
+
+
+def drill_up(depth):
+    st.session_state.hierarchy_path = descend(st.session_state.hierarchy_path[:depth])
+
+
+# 현재 경로 (세션 상태) - as_of 변경 등으로 없어진 노드면 가능한 곳까지만 유지
+path = st.session_state.get("hierarchy_path", [])
+valid = []
+for value in path:
+    if value not in rollups.children(valid).index:
+        break
+    valid.append(value)
+path = st.session_state.hierarchy_path = descend(valid)
+
+# 🧭 breadcrumb (클릭하면 해당 단계로 drill-up)
+crumbs = [(0, "🏠 All")] + [
+    (depth + 1, value) for depth, value in enumerate(path) if value != hierarchy.UNASSIGNED
+]
+crumb_cols = st.columns(len(crumbs) + 1)
+for col, (depth, label) in zip(crumb_cols, crumbs):
+    col.button(label, key=f"hierarchy_crumb_{depth}", on_click=drill_up, args=(depth,), disabled=descend(path[:depth]) == path)
+
+# 📌 현재 노드 요약
+node = rollups.node(path)
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Events", f"{node['Events']:,}")
+col2.metric("Active Users", node["Users"])
+col3.metric("Last 7 Days", node["week4"], delta=int(node["week4"] - node["week3"]))
+col4.metric("Last Active", str(node["Last Active"]))
+
+# 👇 하위 단계 (drill-down)
+children = rollups.children(path)
+if not children.empty:
+    child_level = levels[len(path)]
+    st.markdown(f"### 👇 {child_level.replace('_', ' ').title()} Breakdown")
+    st.selectbox(
+        f"Drill down into {child_level.replace('_', ' ')}",
+        children.index.tolist(),
+        index=None,
+        placeholder="Select...",
+        key="hierarchy_drill",
+        on_change=drill_down,
+    )
+
+    # 하위 노드별 최근 4주 이벤트 (이벤트 많은 순 상위 20개)
+    top_children = children.head(20)
+    df_child_weeks = (
+        top_children[hierarchy.WEEKS]
+        .rename_axis(index="node", columns="week")
+        .stack()
+        .rename("count")
+        .reset_index()
+    )
+    fig = px.bar(
+        df_child_weeks,
+        x="count",
+        y="node",
+        color="week",
+        orientation="h",
+        category_orders={"node": top_children.index.tolist(), "week": hierarchy.WEEKS},
+        labels={"node": child_level, "count": "Events", "week": "Week"},
+    )
+    fig.update_layout(height=max(250, 28 * len(top_children)), margin=dict(l=50, r=50, t=30, b=50))
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(children, use_container_width=True)
+    download_buttons(children, "_".join(["hierarchy"] + path + [child_level]), key="export_hierarchy_children")
+
+# 📊 기능 × 주차 테이블 (현재 노드, week1~week4 순서) + Total
+st.markdown("### 📋 Weekly Function Usage")
+df_functions = rollups.function_weeks(path)
+if df_functions.empty:
+    st.info("No events in the last 4 weeks.")
+else:
+    pivot_df = pivot_with_totals(
+        df_functions,
+        index="function_mode",
+        columns="week_bucket",
+        values="count",
+        column_order=hierarchy.WEEKS,
+    )
+    st.dataframe(pivot_df, use_container_width=True)
+    download_buttons(pivot_df, "_".join(["hierarchy"] + path + ["functions"]), key="export_hierarchy_functions")
+
+    df_chart = pivot_body(pivot_df)
+    fig_functions = px.line(
+        df_chart,
+        x="week_bucket",
+        y="count",
+        color="function_mode",
+        markers=True,
+        category_orders={"week_bucket": hierarchy.WEEKS},
+        labels={"week_bucket": "Week", "count": "Events", "function_mode": "Function"},
+    )
+    fig_functions.update_layout(height=300, margin=dict(l=50, r=50, t=30, b=50))
+    st.plotly_chart(fig_functions, use_container_width=True)
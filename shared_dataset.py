@@ -0,0 +1,82 @@
+import os
+
+import pyarrow as pa
+
+import usage_data
+
+
+# 여러 Streamlit 프로세스가 같은 호스트에서 공유하는 이벤트 테이블 위치
+# /dev/shm(tmpfs)이 있으면 메모리에 두고, 없으면 로컬 캐시 디렉터리 사용
+SHARED_DIR = os.environ.get(
+    "DASHBOARD_SHARED_DIR",
+    "/dev/shm/usage_dashboard" if os.path.isdir("/dev/shm") else os.path.join(usage_data.SNAPSHOT_DIR, "shared"),
+)
+CURRENT_FILE = "CURRENT"
+
+
+def _arrow_path(version, shared_dir):
+    return os.path.join(shared_dir, f"events-{version}.arrow")
+
+
+# 공유 테이블 버전 = 데이터 버전 + 스냅샷 구조 버전 (파생 컬럼이 바뀌면 새 테이블로 publish)
+def table_version(path=usage_data.DATA_PATH):
+    return f"{usage_data.data_version(path)}-v{usage_data.SNAPSHOT_FORMAT}"
+
+
+# 현재 공유 중인 데이터 버전 (없으면 None)
+def current_version(shared_dir=SHARED_DIR):
+    try:
+        with open(os.path.join(shared_dir, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+# 이벤트 테이블을 Arrow IPC 파일로 한 번만 기록하고 CURRENT 포인터를 원자적으로 교체
+# 직전 세대 파일은 다음 publish까지 남겨 둠 (CURRENT를 읽고 아직 attach하지 않은 프로세스가 있을 수 있음)
+# 그보다 오래된 파일은 삭제 - 이미 attach한 프로세스의 매핑은 삭제 후에도 유지됨
+def publish(df, version, shared_dir=SHARED_DIR):
+    os.makedirs(shared_dir, exist_ok=True)
+    previous = current_version(shared_dir)
+    arrow_path = _arrow_path(version, shared_dir)
+    if not os.path.exists(arrow_path):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp_path = f"{arrow_path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, arrow_path)
+
+    pointer_tmp = os.path.join(shared_dir, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+    with open(pointer_tmp, "w") as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(shared_dir, CURRENT_FILE))
+
+    if previous == version:
+        return arrow_path
+    keep = {os.path.basename(arrow_path)}
+    if previous is not None:
+        keep.add(os.path.basename(_arrow_path(previous, shared_dir)))
+    for name in os.listdir(shared_dir):
+        if name.startswith("events-") and name.endswith(".arrow") and name not in keep:
+            os.remove(os.path.join(shared_dir, name))
+    return arrow_path
+
+
+# 읽기 전용 memory map으로 attach (문자열 컬럼은 복사 없이 매핑된 버퍼를 그대로 사용)
+def attach(version, shared_dir=SHARED_DIR):
+    source = pa.memory_map(_arrow_path(version, shared_dir), "r")
+    table = pa.ipc.open_file(source).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+# 현재 데이터 버전의 공유 테이블 로딩 - 아직 아무 프로세스도 publish하지 않았으면 직접 publish
+def load_shared(path=usage_data.DATA_PATH, shared_dir=SHARED_DIR):
+    version = table_version(path)
+    if current_version(shared_dir) == version:
+        try:
+            return attach(version, shared_dir)
+        except FileNotFoundError:
+            pass  # 다른 프로세스가 교체 중 - 아래에서 다시 publish
+    publish(usage_data.load_snapshot(path), version, shared_dir)
+    return attach(version, shared_dir)
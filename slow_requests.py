@@ -0,0 +1,58 @@
+import heapq
+import itertools
+
+import pandas as pd
+
+
+SLOW_COLUMNS = ['created_at', 'agent_type', 'time_to_first_byte', 'id', 'organization']
+
+
+# 느린 요청 top-K 인덱스: (날짜, 조직, agent_type)별 최소 힙을 K개로 유지
+# 범위 조회(최근 7/30일, 조직별 등)는 해당 힙들을 병합해서 top-K 추출
+class SlowRequestIndex:
+    def __init__(self, k=10):
+        self.k = k
+        self.heaps = {}  # {day: {(organization, agent_type): [(ttfb, seq, record), ...]}}
+        self._seq = itertools.count()
+
+    # time_to_first_byte는 이상치 제거 + 초 단위로 변환된 값 기준
+    def add(self, df):
+        valid = df[df['time_to_first_byte'].notna()]
+        if valid.empty:
+            return
+        # 그룹별 상위 K개만 힙에 넣기
+        valid = valid.assign(day=valid['created_at'].dt.date)
+        top = (
+            valid.sort_values('time_to_first_byte', ascending=False)
+            .groupby(['day', 'organization', 'agent_type'], sort=False, dropna=False)
+            .head(self.k)
+        )
+        for row in top[['day'] + SLOW_COLUMNS].itertuples(index=False, name=None):
+            day, record = row[0], row[1:]
+            heap = self.heaps.setdefault(day, {}).setdefault((record[4], record[1]), [])
+            item = (record[2], next(self._seq), record)
+            if len(heap) < self.k:
+                heapq.heappush(heap, item)
+            elif item[0] > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+    # [start_date, end_date] 범위의 top-K (조직/기능 필터 선택)
+    def top(self, start_date, end_date=None, organization=None, agent_type=None, k=None):
+        end_date = start_date if end_date is None else end_date
+        candidates = (
+            heap
+            for day, groups in self.heaps.items() if start_date <= day <= end_date
+            for (org, agent), heap in groups.items()
+            if (organization is None or org == organization)
+            and (agent_type is None or agent == agent_type)
+        )
+        merged = heapq.nlargest(k or self.k, itertools.chain.from_iterable(candidates))
+        top = pd.DataFrame([item[2] for item in merged], columns=SLOW_COLUMNS)
+        # 결과가 없어도 created_at은 datetime 타입 유지
+        return top.assign(created_at=pd.to_datetime(top['created_at']))
+
+
+def build_slow_request_index(df_time, k=10):
+    index = SlowRequestIndex(k)
+    index.add(df_time)
+    return index
@@ -0,0 +1,48 @@
+import itertools
+import sqlite3
+import types
+
+import disk_cache
+
+
+# 크기 초과 시 가장 오래 조회되지 않은 항목부터 삭제 (get으로 조회하면 순서가 뒤로 감)
+def test_put_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = itertools.count(1000, disk_cache.TOUCH_INTERVAL + 1)
+    monkeypatch.setattr(disk_cache, 'time', types.SimpleNamespace(time=lambda: next(clock)))
+    path = str(tmp_path / "cache.sqlite")
+    value = b"x" * 1000
+    max_bytes = 3 * len(disk_cache.pickle.dumps(value, protocol=disk_cache.pickle.HIGHEST_PROTOCOL))
+
+    for key in ['a', 'b', 'c']:
+        disk_cache.put(key, value, path, max_bytes)
+    assert disk_cache.get('a', path) == value
+
+    disk_cache.put('d', value, path, max_bytes)
+    assert disk_cache.get('b', path) is disk_cache._MISSING
+    assert [disk_cache.get(key, path) for key in ['a', 'c', 'd']] == [value] * 3
+
+    disk_cache.put('e', value, path, max_bytes)
+    assert disk_cache.get('a', path) is disk_cache._MISSING
+    assert disk_cache.get('c', path) == value
+
+
+# 복원할 수 없는 항목은 캐시 미스 → 다시 계산해서 덮어씀
+def test_unreadable_entry_is_a_miss(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    disk_cache.put('key', 1, path)
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE entries SET value = ? WHERE key = 'key'", (b"\x80\x05not a pickle",))
+    conn.commit()
+    conn.close()
+
+    assert disk_cache.get('key', path) is disk_cache._MISSING
+    assert disk_cache.get_or_set('key', lambda: 2, path) == 2
+    assert disk_cache.get('key', path) == 2
+
+
+# 코드 지문이 바뀌면 같은 이름 / 인자라도 다른 키
+def test_key_includes_code_version(monkeypatch):
+    key = disk_cache.make_key("dashboard_utils.load_dataset", "2025-07-01", "v1")
+    assert disk_cache.code_version() in key
+    monkeypatch.setattr(disk_cache, 'code_version', lambda: "changed")
+    assert disk_cache.make_key("dashboard_utils.load_dataset", "2025-07-01", "v1") != key
@@ -0,0 +1,52 @@
+import io
+
+import pandas as pd
+import pytest
+
+import exports
+
+
+def _events(n=25):
+    return pd.DataFrame({
+        'organization': ['Acme', 'Globex'] * (n // 2) + ['Acme'] * (n % 2),
+        'events': range(n),
+        'time_to_first_byte': [None] * 10 + [float(i) for i in range(n - 10)],  # 앞쪽 chunk는 전부 결측
+        'created_at': pd.date_range('2025-07-01', periods=n, freq='h'),
+    })
+
+
+def _read(data, fmt):
+    if fmt == 'csv':
+        df = pd.read_csv(io.BytesIO(data))
+        return df.assign(created_at=pd.to_datetime(df['created_at'])) if 'created_at' in df else df
+    if fmt == 'xlsx':
+        return pd.read_excel(io.BytesIO(data))
+    return pd.read_parquet(io.BytesIO(data))
+
+
+# 여러 chunk로 나눠 써도 한 번에 쓴 표와 같은 내용 (필터링 후 남은 행 번호는 버림)
+@pytest.mark.parametrize('fmt', list(exports.FORMATS))
+def test_export_round_trip(fmt):
+    df = _events()
+    filtered = df[df['events'] % 3 != 0]
+    result = _read(exports.export_bytes(filtered, fmt, chunksize=4), fmt)
+    pd.testing.assert_frame_equal(result, filtered.reset_index(drop=True), check_dtype=False)
+
+
+# 피벗 표는 인덱스를 열로 꺼내서 내보냄
+@pytest.mark.parametrize('fmt', list(exports.FORMATS))
+def test_export_keeps_named_index(fmt):
+    table = _events().pivot_table(index='organization', values='events', aggfunc='sum')
+    result = _read(exports.export_bytes(table, fmt, chunksize=1), fmt)
+    assert result['organization'].tolist() == ['Acme', 'Globex']
+    assert result['events'].tolist() == table['events'].tolist()
+
+
+# 시트 최대 행 수를 넘으면 다음 시트에 헤더부터 이어서 씀
+def test_xlsx_continues_on_next_sheet(monkeypatch):
+    monkeypatch.setattr(exports, 'XLSX_MAX_ROWS', 10)
+    df = _events()
+    sheets = pd.read_excel(io.BytesIO(exports.export_bytes(df, 'xlsx', chunksize=4)), sheet_name=None)
+    assert list(sheets) == ['Export', 'Export 2', 'Export 3']
+    result = pd.concat(sheets.values(), ignore_index=True)
+    pd.testing.assert_frame_equal(result, df, check_dtype=False)
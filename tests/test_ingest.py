@@ -0,0 +1,50 @@
+import pandas as pd
+
+from ingest import EVENT_COLUMNS, EventStore
+
+
+def _export(rows):
+    df = pd.DataFrame(rows).reindex(columns=EVENT_COLUMNS)
+    df['created_at'] = pd.to_datetime(df['created_at'])
+    df['status'] = 'active'
+    df['sender'] = 'user'
+    return df
+
+
+MESSAGE = {
+    'id': 'msg-1', 'function_mode': 'normal', 'user_name': 'A', 'user_email': 'a@acme.com',
+    'organization': 'Acme', 'time_to_first_byte': 1200.0, 'created_at': '2025-07-01 09:00:00',
+}
+CATALYST = {
+    'function_mode': 'catalysts', 'user_name': 'A', 'user_email': 'a@acme.com',
+    'organization': 'Acme', 'created_at': '2025-07-01 10:00:00',
+}
+
+
+def _store(tmp_path):
+    return EventStore(str(tmp_path / "df_all.csv"), str(tmp_path / "event_index"))
+
+
+# df_all.csv의 id 없는 catalysts 행은 합성 키로 찾아 export의 id로 채움
+# 같은 export를 다시 넣으면 CSV를 읽지 않고 (0, 0)
+def test_upsert_fills_catalyst_id_and_skips_reingest(tmp_path):
+    _export([MESSAGE, CATALYST]).to_csv(tmp_path / "df_all.csv", index=False)
+    export = _export([MESSAGE, dict(CATALYST, id='cat-1')])
+
+    store = _store(tmp_path)
+    assert store.upsert(export) == (0, 1)
+    store.save()
+    saved = pd.read_csv(tmp_path / "df_all.csv")
+    assert saved['id'].tolist() == ['msg-1', 'cat-1']
+
+    store = _store(tmp_path)
+    assert store.upsert(export) == (0, 0)
+    assert store._events is None
+
+    new = _export([dict(MESSAGE, id='msg-2', created_at='2025-07-02 09:00:00')])
+    assert store.upsert(new) == (1, 0)
+    store.save()
+    assert store._events is None
+    saved = pd.read_csv(tmp_path / "df_all.csv")
+    assert saved['id'].tolist() == ['msg-1', 'cat-1', 'msg-2']
+    assert _store(tmp_path).upsert(export) == (0, 0)
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from latency import GAMMA, build_latency_sketch
+
+
+def _requests(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    ttfb = rng.lognormal(mean=1.5, sigma=1.0, size=n)
+    ttfb[rng.random(n) < 0.1] = np.nan  # catalysts 등 TTFB 없는 요청
+    return pd.DataFrame({
+        'created_at': pd.Timestamp('2025-07-01') + pd.to_timedelta(rng.integers(0, 7 * 86400, n), unit='s'),
+        'agent_type': rng.choice(['normal', 'deep_research'], n),
+        'organization': rng.choice(['Acme', 'Globex'], n),
+        'time_to_first_byte': ttfb,
+    })
+
+
+# 히스토그램 분위수는 원본 np.quantile과 버킷 하나(GAMMA 배) 이내
+# (히스토그램은 보간 없이 순위에 해당하는 값이 든 버킷을 고르므로 inverted_cdf와 비교)
+def test_quantiles_within_one_bucket():
+    df = _requests()
+    stats = build_latency_sketch(df).quantiles(freq='D', by='agent_type')
+    timed = df.dropna(subset=['time_to_first_byte'])
+    groups = timed.groupby([timed['created_at'].dt.floor('D'), 'agent_type'])['time_to_first_byte']
+    assert len(stats) == groups.ngroups
+    for row in stats.itertuples():
+        values = groups.get_group((row.period, row.agent_type)).to_numpy()
+        assert row.count == len(values)
+        for q, estimate in [(0.5, row.p50), (0.95, row.p95)]:
+            ratio = estimate / np.quantile(values, q, method='inverted_cdf')
+            assert 1 / GAMMA <= ratio <= GAMMA
+
+
+# weight=-1로 뺀 결과 = 남은 행으로 새로 만든 집계
+def test_add_negative_weight_removes_rows():
+    df = _requests()
+    removed = df.sample(frac=0.3, random_state=0)
+    sketch = build_latency_sketch(df)
+    sketch.add(removed, weight=-1)
+    expected = build_latency_sketch(df.drop(removed.index)).counts
+    pd.testing.assert_frame_equal(sketch.counts.sort_index(), expected.sort_index())
@@ -0,0 +1,15 @@
+import pandas as pd
+
+import shared_dataset
+
+
+# CURRENT를 v1으로 읽은 프로세스는 v2 publish 뒤에도 v1에 attach 가능, v3 publish 때 v1 삭제
+def test_publish_keeps_previous_generation(tmp_path):
+    df = pd.DataFrame({'organization': ['Acme', 'Globex'], 'events': [1, 2]})
+    for version in ['v1', 'v2']:
+        shared_dataset.publish(df.assign(version=version), version, tmp_path)
+    assert shared_dataset.current_version(tmp_path) == 'v2'
+    assert shared_dataset.attach('v1', tmp_path)['version'].tolist() == ['v1', 'v1']
+
+    shared_dataset.publish(df.assign(version='v3'), 'v3', tmp_path)
+    assert sorted(path.name for path in tmp_path.glob("*.arrow")) == ['events-v2.arrow', 'events-v3.arrow']
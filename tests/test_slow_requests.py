@@ -0,0 +1,47 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from slow_requests import build_slow_request_index
+
+
+def _requests(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'created_at': pd.Timestamp('2025-07-01') + pd.to_timedelta(rng.integers(0, 30 * 86400, n), unit='s'),
+        'agent_type': rng.choice(['normal', 'deep_research', 'pulse_check'], n),
+        'time_to_first_byte': rng.permutation(n) / 10 + 0.1,  # 동률 없이
+        'id': [f"req-{i}" for i in range(n)],
+        'organization': rng.choice(['Acme', 'Globex', 'Initech'], n),
+    })
+
+
+# 힙 병합 결과 = 같은 조건으로 원본 행을 nlargest 한 결과
+def test_top_matches_nlargest():
+    df = _requests()
+    index = build_slow_request_index(df, k=10)
+    day = df['created_at'].dt.date
+    cases = [
+        (datetime.date(2025, 7, 1), datetime.date(2025, 7, 30), None, None),
+        (datetime.date(2025, 7, 10), datetime.date(2025, 7, 16), 'Acme', None),
+        (datetime.date(2025, 7, 20), datetime.date(2025, 7, 20), None, 'deep_research'),
+        (datetime.date(2025, 7, 5), datetime.date(2025, 7, 25), 'Globex', 'normal'),
+    ]
+    for start, end, org, agent in cases:
+        mask = (day >= start) & (day <= end)
+        if org:
+            mask &= df['organization'] == org
+        if agent:
+            mask &= df['agent_type'] == agent
+        expected = df[mask].nlargest(10, 'time_to_first_byte')
+        result = index.top(start, end, organization=org, agent_type=agent)
+        assert result['id'].tolist() == expected['id'].tolist()
+        assert result['time_to_first_byte'].tolist() == expected['time_to_first_byte'].tolist()
+
+
+def test_top_empty_range_keeps_datetime():
+    index = build_slow_request_index(_requests(), k=10)
+    result = index.top(datetime.date(2024, 1, 1), datetime.date(2024, 1, 31))
+    assert result.empty
+    assert pd.api.types.is_datetime64_any_dtype(result['created_at'])
@@ -0,0 +1,27 @@
+import pandas as pd
+
+import time_saved
+
+
+# 작업 폴더에 saved_minutes.json이 없어도 (loadtest 임시 폴더 등) 모델은 모듈 옆 파일에서 읽음
+def test_load_ledger_from_other_cwd(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    pd.DataFrame({
+        'organization': ['Acme', 'Acme', 'Acme'],
+        'user_email': ['a@acme.com', 'a@acme.com', 'b@acme.com'],
+        'user_name': ['A', 'A', 'B'],
+        'function_mode': ['deep_research', 'normal', 'deep_research:report'],
+        'status': ['active', 'active', 'active'],
+        'created_at': ['2025-07-01 09:00:00', '2025-07-01 10:00:00', '2025-07-03 11:00:00'],
+        'trial_start_date': [None, None, None],
+    }).to_csv("df_all.csv", index=False)
+
+    model = time_saved.load_model()
+    ledger = time_saved.load_ledger()
+
+    assert not (tmp_path / "saved_minutes.json").exists()
+    assert list((tmp_path / ".cache").glob("roi-*.parquet"))
+    by_user = ledger.groupby('user_email')[['events', 'saved_minutes']].sum()
+    assert by_user.loc['a@acme.com', 'events'] == 2
+    assert by_user.loc['a@acme.com', 'saved_minutes'] == model['agent_type']['deep_research'] + model['default']
+    assert by_user.loc['b@acme.com', 'saved_minutes'] == model['agent_type']['deep_research']
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from user_activity import UserActivityIndex
+
+
+def _events(n=1500, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'organization': rng.choice(['Acme', 'Globex'], n),
+        'user_name': rng.choice([f"user{i}" for i in range(40)], n),
+        'status': 'active',
+        'created_at': pd.Timestamp('2025-06-01') + pd.to_timedelta(rng.integers(0, 60 * 86400, n), unit='s'),
+    })
+
+
+def _brute_force(df, org, start, end):
+    day = df['created_at'].dt.normalize()
+    rows = df[(df['organization'] == org) & (day >= pd.Timestamp(start)) & (day <= pd.Timestamp(end))]
+    return set(rows['user_name'])
+
+
+# 비트셋 OR + popcount = 기간 내 distinct 유저
+def test_distinct_and_churn_match_brute_force():
+    df = _events()
+    index = UserActivityIndex(df)
+    for start, end in [('2025-06-01', '2025-06-01'), ('2025-06-10', '2025-06-16'), ('2025-05-01', '2025-08-31')]:
+        assert index.distinct('Acme', start, end) == len(_brute_force(df, 'Acme', start, end))
+
+    previous, current = ('2025-06-01', '2025-06-07'), ('2025-06-08', '2025-06-14')
+    expected = _brute_force(df, 'Globex', *previous) - _brute_force(df, 'Globex', *current)
+    assert index.churned_users('Globex', previous, current) == sorted(expected)
+
+
+# rolling_distinct(7)의 각 날짜 값 = 직전 7일 distinct 유저 수 (end_date 이후 빈 날짜 포함)
+def test_rolling_distinct_matches_brute_force():
+    df = _events()
+    index = UserActivityIndex(df)
+    rolling = index.rolling_distinct('Acme', 7, end_date='2025-08-05')
+    assert rolling.index[-1] == pd.Timestamp('2025-08-05')
+    for day in rolling.index[::5]:
+        expected = _brute_force(df, 'Acme', day - pd.Timedelta(days=6), day)
+        assert rolling[day] == len(expected)
@@ -0,0 +1,25 @@
+import pandas as pd
+
+import xlsx_stream
+from documents import DOCUMENT_COLUMNS, DOCUMENTS_PATH, DOCUMENTS_SHEET
+
+
+# 문서 export: 선택한 열만 읽어도 (chunk 경계 포함) read_excel과 같은 값 / dtype
+def test_read_xlsx_matches_read_excel():
+    columns = DOCUMENT_COLUMNS + ['manual']
+    result = xlsx_stream.read_xlsx(DOCUMENTS_PATH, sheet=DOCUMENTS_SHEET, columns=columns, chunksize=5000)
+    expected = pd.read_excel(DOCUMENTS_PATH, sheet_name=DOCUMENTS_SHEET, usecols=columns)
+    pd.testing.assert_frame_equal(result, expected[result.columns])
+
+
+# 중간의 빈 행은 NaN 행, 마지막 빈 행은 버림 / 빈 셀이 섞인 True/False 열은 float
+def test_read_xlsx_blank_rows_and_bools(tmp_path):
+    path = tmp_path / "blank.xlsx"
+    pd.DataFrame({
+        'count': [1, None, None, 3, None],
+        'flag': [True, None, None, False, None],
+        'name': ['x', None, None, 'y', None],
+    }).to_excel(path, index=False)
+    expected = pd.read_excel(path)
+    for chunksize in [1, 10000]:
+        pd.testing.assert_frame_equal(xlsx_stream.read_xlsx(path, chunksize=chunksize), expected)
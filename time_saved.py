@@ -0,0 +1,100 @@
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+import usage_data
+
+
+# 절감 시간 모델 (요청 1건당 분): 기본값 → agent_type → function_mode 전체 값 순으로 덮어씀
+# organizations.<조직>에 같은 구조(default / agent_type / function_mode)로 조직별 예외 지정
+# 값을 바꾸면 version도 올릴 것 - ledger는 (데이터 버전, 모델 버전)별로 한 번만 다시 계산
+# 데이터 파일과 달리 코드와 함께 배포되는 설정이라 작업 폴더가 아닌 모듈 위치 기준
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saved_minutes.json")
+LEDGER_FORMAT = 1
+LEDGER_KEYS = ['organization', 'user_email', 'user_name', 'week', 'day']
+
+
+def load_model(path=MODEL_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+# 모델 버전: 설정의 version + 내용 해시 (version을 안 올리고 값만 바꿔도 새 키)
+def model_version(model=None):
+    model = model if model is not None else load_model()
+    digest = hashlib.sha1(json.dumps(model, sort_keys=True).encode()).hexdigest()[:8]
+    return f"{model.get('version', 0)}-{digest}"
+
+
+def _lookup(rules, df, default):
+    minutes = df['agent_type'].map(rules.get('agent_type', {}))
+    return df['function_mode'].map(rules.get('function_mode', {})).fillna(minutes).fillna(default)
+
+
+# 이벤트별 절감 시간 (분): 조직 예외 > 전체 규칙 순
+def saved_minutes(df, model=None):
+    model = model if model is not None else load_model()
+    minutes = _lookup(model, df, model.get('default', 0)).astype(float)
+    for org, rules in model.get('organizations', {}).items():
+        in_org = df['organization'] == org
+        if in_org.any():
+            org_minutes = _lookup(rules, df[in_org], rules.get('default', np.nan))
+            minutes[in_org] = org_minutes.fillna(minutes[in_org])
+    return minutes
+
+
+# 조직 × 유저 × 주(월요일 시작) ROI ledger: 요청 수 / 절감 시간 합계
+# as_of로 기간을 자를 수 있도록 주 안에서 일 단위로 나눠 둠 (week = 해당 일의 주 시작일)
+def build_ledger(df, model=None):
+    active = df[(df['status'] == 'active') & df['created_at'].notna()]
+    day = active['created_at'].dt.normalize()
+    ledger = pd.DataFrame({
+        'organization': active['organization'],
+        'user_email': active['user_email'],
+        'user_name': active['user_name'],
+        'week': day - pd.to_timedelta(day.dt.dayofweek, unit='D'),
+        'day': day,
+        'events': 1,
+        'saved_minutes': saved_minutes(active, model),
+    })
+    return ledger.groupby(LEDGER_KEYS, dropna=False).sum().reset_index()
+
+
+# 기존 ledger에 추가된 행은 더하고 바뀌기 전 행은 빼서 갱신 (합계가 0이 된 칸은 제거)
+def update_ledger(ledger, added, removed, model=None):
+    removed = build_ledger(removed, model)
+    removed[['events', 'saved_minutes']] *= -1
+    ledger = pd.concat([ledger, build_ledger(added, model), removed], ignore_index=True)
+    ledger = ledger.groupby(LEDGER_KEYS, dropna=False).sum().reset_index()
+    return ledger[ledger['events'] != 0].reset_index(drop=True)
+
+
+def ledger_snapshot_path(version, model, snapshot_dir=usage_data.SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f"roi-{version}-m{model_version(model)}-v{LEDGER_FORMAT}.parquet")
+
+
+# 데이터 버전 + 모델 버전별 parquet 스냅샷 (ingest 직후 생성, 대시보드는 읽기만 함)
+def load_ledger(path=usage_data.DATA_PATH, snapshot_dir=usage_data.SNAPSHOT_DIR, model_path=MODEL_PATH):
+    model = load_model(model_path)
+    snapshot_path = ledger_snapshot_path(usage_data.data_version(path), model, snapshot_dir)
+    if os.path.exists(snapshot_path):
+        return pd.read_parquet(snapshot_path)
+
+    ledger = build_ledger(usage_data.load_snapshot(path, snapshot_dir), model)
+    usage_data.write_snapshot(ledger, snapshot_path)
+    return ledger
+
+
+# as_of까지의 조직 ledger
+def org_ledger(ledger, organization, as_of):
+    return ledger[(ledger['organization'] == organization) & (ledger['day'] <= pd.Timestamp(as_of))]
+
+
+# 주 × 유저 절감 시간 (시간 단위) - ROI 차트용
+def weekly_hours(ledger):
+    weekly = ledger.groupby(['week', 'user_name'], dropna=False)[['events', 'saved_minutes']].sum().reset_index()
+    weekly['saved_hours'] = weekly['saved_minutes'] / 60
+    return weekly
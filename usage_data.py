@@ -0,0 +1,141 @@
+import os
+
+import pandas as pd
+
+
+DATA_PATH = "df_all.csv"
+SNAPSHOT_DIR = ".cache"
+SNAPSHOT_FORMAT = 3  # load_events 결과 구조가 바뀌면 올려서 이전 스냅샷 무효화
+
+# 데이터 버전: 파일이 바뀌면 캐시 키도 바뀌도록 mtime + size 사용
+def data_version(path=DATA_PATH):
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+# 기준 날짜 파싱 (URL 파라미터 등), 실패 시 오늘 날짜
+def parse_as_of(value):
+    try:
+        as_of = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        as_of = pd.NaT
+    if pd.isna(as_of):
+        as_of = pd.Timestamp.now()
+    return as_of.date()
+
+
+# 기준 날짜 정오 기준 최근 4주 범위
+def build_week_ranges(as_of):
+    now = pd.Timestamp(as_of).normalize() + pd.Timedelta(hours=12)
+    return {
+        'week4': (now - pd.Timedelta(days=6), now),
+        'week3': (now - pd.Timedelta(days=13), now - pd.Timedelta(days=7)),
+        'week2': (now - pd.Timedelta(days=20), now - pd.Timedelta(days=14)),
+        'week1': (now - pd.Timedelta(days=27), now - pd.Timedelta(days=21)),
+    }
+
+
+# 주차 버킷 할당 (행 단위 apply 대신 구간 비교)
+def assign_week_buckets(created_at, week_ranges):
+    buckets = pd.Series(None, index=created_at.index, dtype=object)
+    for week, (start, end) in week_ranges.items():
+        buckets[created_at.between(start, end)] = week
+    return buckets
+
+
+# 원본 로딩 + as_of와 무관한 파생 컬럼
+# (organization, created_at) 순으로 정렬해 두고 org_slice / time_slice로 구간 조회
+def load_events(path=DATA_PATH):
+    return prepare_events(pd.read_csv(path))
+
+
+# 이미 읽어 둔 이벤트 행(ingest의 EventStore 등)에 같은 파생 컬럼 / 정렬 적용
+def prepare_events(df):
+    # Convert created_at and trial_start_date to datetime
+    df = df.assign(
+        created_at=pd.to_datetime(df['created_at']),
+        trial_start_date=pd.to_datetime(df['trial_start_date']),
+    )
+
+    df['agent_type'] = df['function_mode'].str.split(":").str[0]
+    return df.sort_values(['organization', 'created_at'], kind='stable').reset_index(drop=True)
+
+
+def events_snapshot_path(version, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f"events-{version}-v{SNAPSHOT_FORMAT}.parquet")
+
+
+# 파싱 + 파생 컬럼 결과를 데이터 버전별 parquet 스냅샷으로 저장
+# 컨테이너 재시작 시 CSV 재파싱 없이 스냅샷에서 바로 로딩
+def load_snapshot(path=DATA_PATH, snapshot_dir=SNAPSHOT_DIR):
+    snapshot_path = events_snapshot_path(data_version(path), snapshot_dir)
+    if os.path.exists(snapshot_path):
+        return pd.read_parquet(snapshot_path)
+
+    df = load_events(path)
+    write_snapshot(df, snapshot_path)
+    return df
+
+
+# parquet 스냅샷 원자적 기록 (임시 파일 → 교체) + 같은 종류(파일명 prefix)의 이전 버전 정리
+def write_snapshot(df, snapshot_path):
+    snapshot_dir, snapshot_name = os.path.split(snapshot_path)
+    prefix = snapshot_name.split("-")[0] + "-"
+    os.makedirs(snapshot_dir, exist_ok=True)
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, snapshot_path)
+
+    for name in os.listdir(snapshot_dir):
+        if name.startswith(prefix) and name.endswith(".parquet") and name != snapshot_name:
+            os.remove(os.path.join(snapshot_dir, name))
+
+
+# as_of 시점 스냅샷: as_of 이후 이벤트 제외 (created_at 없는 유저 상태 행은 유지) + 주차 버킷
+# 정렬 순서는 load_events 그대로 유지, 제외할 이벤트가 없으면 원본 컬럼을 복사하지 않음
+def events_as_of(df, as_of):
+    cutoff = pd.Timestamp(as_of).normalize() + pd.Timedelta(days=1)
+    if df['created_at'].max() >= cutoff:
+        df = df[df['created_at'].isna() | (df['created_at'] < cutoff)].reset_index(drop=True)
+    return df.assign(week_bucket=assign_week_buckets(df['created_at'], build_week_ranges(as_of)))
+
+
+# 조직별 연속 행 범위 {organization: (start, stop)} - events_as_of 결과 기준
+def org_bounds(df):
+    return {
+        org: (int(rows[0]), int(rows[-1]) + 1)
+        for org, rows in df.groupby('organization', sort=False).indices.items()
+    }
+
+
+# 조직별 active 이벤트 수 (내림차순) - 조직 선택 목록 순서
+def org_event_counts(df):
+    return (
+        df[df['status'] == 'active']
+        .groupby('organization')
+        .size()
+        .sort_values(ascending=False)
+    )
+
+
+# 조직 구간 (복사 없이 iloc 슬라이스)
+def org_slice(df, org, bounds):
+    start, stop = bounds.get(org, (0, 0))
+    return df.iloc[start:stop]
+
+
+# 날짜 구간 [start_date, end_date] (하루 단위, 양 끝 포함) - created_at 정렬 가정, 이진 탐색
+def time_slice(df, start_date, end_date):
+    start = pd.Timestamp(start_date).normalize()
+    end = pd.Timestamp(end_date).normalize() + pd.Timedelta(days=1)
+    lo = df['created_at'].searchsorted(start, side='left')
+    hi = df['created_at'].searchsorted(end, side='left')
+    return df.iloc[lo:hi]
+
+
+# 응답 시간 전처리: 이상치(0 이하, 5분 초과) 제거 후 ms → 초
+def response_times(df):
+    df_time = df.copy()
+    ttfb = df_time['time_to_first_byte']
+    df_time['time_to_first_byte'] = ttfb.where((ttfb > 0) & (ttfb <= 300000)) / 1000
+    return df_time
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+
+# 바이트별 1비트 개수 (popcount 룩업 테이블)
+POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+# 조직별 (일 × 유저) 활동 비트셋
+# 유저를 정수 id로 매핑하고 하루당 ceil(유저 수 / 8) 바이트로 저장
+# → 임의 기간 distinct 유저 수 = 해당 일자 행 OR + popcount (이벤트 수와 무관)
+class UserActivityIndex:
+    def __init__(self, df, user_col='user_name'):
+        active = df['status'].eq('active') & df['created_at'].notna() & df[user_col].notna()
+        events = df.loc[active, ['organization', 'created_at', user_col]]
+        self.orgs = {}
+        for org, org_events in events.groupby('organization'):
+            days = org_events['created_at'].dt.normalize()
+            first_day = days.min()
+            day_ids = ((days - first_day).dt.days).to_numpy()
+            user_ids, users = pd.factorize(org_events[user_col])
+            matrix = np.zeros((day_ids.max() + 1, len(users)), dtype=bool)
+            matrix[day_ids, user_ids] = True
+            self.orgs[org] = {
+                'first_day': first_day,
+                'users': np.asarray(users),
+                'bits': np.packbits(matrix, axis=1),
+            }
+
+    # [start_date, end_date] (양 끝 포함) 기간 활동 유저 비트마스크
+    def window(self, org, start_date, end_date):
+        entry = self.orgs.get(org)
+        if entry is None:
+            return np.zeros(0, dtype=np.uint8)
+        lo = max((pd.Timestamp(start_date).normalize() - entry['first_day']).days, 0)
+        hi = max((pd.Timestamp(end_date).normalize() - entry['first_day']).days + 1, 0)
+        bits = entry['bits'][lo:hi]
+        if len(bits) == 0:
+            return np.zeros(entry['bits'].shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(bits, axis=0)
+
+    def distinct(self, org, start_date, end_date):
+        return int(POPCOUNT[self.window(org, start_date, end_date)].sum())
+
+    # 비트마스크 → 유저 이름 (정렬)
+    def users(self, org, mask):
+        if len(mask) == 0:
+            return []
+        entry = self.orgs[org]
+        flags = np.unpackbits(mask)[:len(entry['users'])].astype(bool)
+        return sorted(entry['users'][flags])
+
+    # 모든 기간에 활동한 유저 (예: 최근 N주 연속 사용자)
+    def consistent_users(self, org, windows):
+        masks = [self.window(org, start, end) for start, end in windows]
+        return self.users(org, np.bitwise_and.reduce(masks, axis=0))
+
+    # 이전 기간엔 활동했지만 최근 기간엔 활동하지 않은 유저
+    def churned_users(self, org, previous, current):
+        before = self.window(org, *previous)
+        after = self.window(org, *current)
+        return self.users(org, before & ~after)
+
+    # 일별 rolling distinct 유저 수 (window_days=1: DAU, 7: WAU, 30: MAU)
+    def rolling_distinct(self, org, window_days, end_date=None):
+        entry = self.orgs.get(org)
+        if entry is None:
+            return pd.Series(dtype=int)
+        bits = entry['bits']
+        if end_date is not None:
+            n_days = (pd.Timestamp(end_date).normalize() - entry['first_day']).days + 1
+            if n_days <= 0:
+                return pd.Series(dtype=int)
+            # 마지막 활동일 이후 ~ end_date 구간은 빈 행으로 채움
+            padding = np.zeros((max(n_days - len(bits), 0), bits.shape[1]), dtype=np.uint8)
+            bits = np.vstack([bits, padding])[:n_days]
+        padded = np.vstack([np.zeros((window_days - 1, bits.shape[1]), dtype=np.uint8), bits])
+        windows = np.lib.stride_tricks.sliding_window_view(padded, window_days, axis=0)
+        counts = POPCOUNT[np.bitwise_or.reduce(windows, axis=2)].sum(axis=1)
+        index = pd.date_range(entry['first_day'], periods=len(bits), freq='D')
+        return pd.Series(counts, index=index)
@@ -0,0 +1,53 @@
+import argparse
+import os
+import time
+
+import disk_cache
+import usage_data
+
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Main.py")
+
+
+# 배포/재시작 직후 실행: 상위 조직 화면을 한 번씩 그려서 디스크 캐시(derived 집계 + 차트 spec)를 채움
+# 조직 순서는 대시보드 선택 목록과 같은 org_event_counts 기준
+def warm(as_of, top, timeout=300):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.query_params["as_of"] = as_of
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+    orgs = list(at.selectbox[0].options)[:top]
+    for org in orgs:
+        start = time.perf_counter()
+        at.selectbox[0].select(org).run()
+        if at.exception:
+            print(f"  {org}: error {at.exception[0].value}")
+            continue
+        print(f"  {org}: {time.perf_counter() - start:.2f}s")
+    return orgs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-populate the on-disk result cache for the top organizations.")
+    parser.add_argument("--as-of", default=None, help="as-of date (YYYY-MM-DD, default today)")
+    parser.add_argument("--top", type=int, default=10, help="number of organizations to warm")
+    parser.add_argument("--timeout", type=float, default=300, help="per-rerun timeout in seconds")
+    args = parser.parse_args()
+
+    as_of = usage_data.parse_as_of(args.as_of).isoformat()
+    print(f"warming top {args.top} organizations as of {as_of}")
+    start = time.perf_counter()
+    orgs = warm(as_of, args.top, args.timeout)
+    stats = disk_cache.stats()
+    print(
+        f"{len(orgs)} organizations in {time.perf_counter() - start:.1f}s, "
+        f"cache {stats['entries']} entries / {stats['size_mb']:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
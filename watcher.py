@@ -0,0 +1,91 @@
+import argparse
+import fnmatch
+import json
+import os
+import time
+
+import ingest
+import shared_dataset
+import usage_data
+
+
+WATCH_PATTERNS = ["*_messages.xlsx", "*_catalysts.xlsx", "messages*.xlsx", "catalyst*.xlsx"]
+MANIFEST_PATH = os.path.join(usage_data.SNAPSHOT_DIR, "watch_manifest.json")
+
+
+# 감시 대상 export 파일 {파일명: [mtime_ns, size]} (엑셀 임시 파일 ~$... 제외)
+def scan(directory="."):
+    files = {}
+    for entry in os.scandir(directory):
+        if entry.is_file() and not entry.name.startswith("~$") and any(
+            fnmatch.fnmatch(entry.name, pattern) for pattern in WATCH_PATTERNS
+        ):
+            stat = entry.stat()
+            files[entry.name] = [stat.st_mtime_ns, stat.st_size]
+    return files
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# 새로 생기거나 바뀐 export만 upsert → 데이터 버전(df_all.csv mtime/size)이 바뀌면
+# ingest가 만든 새 이벤트 스냅샷(메모리)을 공유 테이블로 publish해서 대시보드가 바로 attach
+# 읽을 수 없는 파일은 오류만 출력하고 건너뜀 (manifest에는 기록 → 파일이 다시 바뀔 때만 재시도)
+def ingest_changes(changed, store):
+    before = usage_data.data_version()
+    if store.version != before:
+        store = ingest.EventStore()  # 다른 곳에서 df_all.csv를 바꾼 경우 다시 로딩
+    snapshot = ingest.ingest_exports(changed, store, skip_errors=True)
+    if snapshot is None:
+        return store
+    shared_dataset.publish(snapshot, shared_dataset.table_version())
+    print(f"data version {before} -> {store.version}")
+    return store
+
+
+# 주기적으로 폴더를 스캔 - 파일 크기/수정 시각이 두 번 연속 같을 때(쓰기 완료)만 반영
+def watch(directory=".", interval=30, once=False, baseline=False):
+    manifest = load_manifest()
+    if baseline:
+        # 이미 반영된 export들을 기준으로 기록만 하고 ingest하지 않음
+        manifest = scan(directory)
+        save_manifest(manifest)
+    store = ingest.EventStore()
+    pending = {}
+    while True:
+        current = scan(directory)
+        changed = [name for name, stat in current.items() if manifest.get(name) != stat]
+        ready = [name for name in changed if once or pending.get(name) == current[name]]
+        pending = {name: current[name] for name in changed if name not in ready}
+
+        if ready:
+            store = ingest_changes([os.path.join(directory, name) for name in sorted(ready)], store)
+            manifest.update({name: current[name] for name in ready})
+            save_manifest(manifest)
+
+        if once:
+            return
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch the export folder and ingest new/modified workbooks.")
+    parser.add_argument("--dir", default=".", help="folder where *_messages.xlsx / *_catalysts.xlsx are dropped")
+    parser.add_argument("--interval", type=int, default=30, help="polling interval in seconds")
+    parser.add_argument("--once", action="store_true", help="ingest pending changes once and exit")
+    parser.add_argument("--baseline", action="store_true", help="mark current exports as already ingested")
+    args = parser.parse_args()
+    watch(args.dir, args.interval, args.once, args.baseline)
@@ -0,0 +1,218 @@
+import datetime
+import posixpath
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+import numpy as np
+import pandas as pd
+
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+ROW_TAG, CELL_TAG, VALUE_TAG, TEXT_TAG = (f"{MAIN_NS}{tag}" for tag in ("row", "c", "v", "t"))
+
+# 날짜 서식으로 쓰이는 기본 numFmtId (ECMA-376)
+BUILTIN_DATE_FORMATS = set(range(14, 23)) | {45, 46, 47}
+DATE_CODE = re.compile(r"[dmyhs]", re.IGNORECASE)
+FORMAT_LITERAL = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.')
+CELL_COLUMN = re.compile(r"[A-Z]+")
+EXCEL_EPOCH = datetime.datetime(1899, 12, 30)
+# read_excel 기본 na_values와 동일하게 결측 처리할 문자열
+NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+}
+
+
+# tag 요소를 하나씩 넘기고 바로 비워서 XML 전체를 메모리에 올리지 않음
+def _iter_elements(archive, name, tag):
+    with archive.open(name) as f:
+        for _, elem in iterparse(f):
+            if elem.tag == tag:
+                yield elem
+                elem.clear()
+
+
+# {시트 이름: zip 내부 경로} (workbook.xml 순서)
+def _sheet_paths(archive):
+    with archive.open("xl/_rels/workbook.xml.rels") as f:
+        targets = {
+            elem.get("Id"): elem.get("Target")
+            for _, elem in iterparse(f) if elem.tag == f"{PKG_REL_NS}Relationship"
+        }
+    with archive.open("xl/workbook.xml") as f:
+        sheets = [elem for _, elem in iterparse(f) if elem.tag == f"{MAIN_NS}sheet"]
+    paths = {}
+    for sheet in sheets:
+        target = targets[sheet.get(f"{REL_NS}id")]
+        paths[sheet.get("name")] = target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+    return paths
+
+
+def sheet_names(path):
+    with zipfile.ZipFile(path) as archive:
+        return list(_sheet_paths(archive))
+
+
+# 날짜 서식이 적용된 셀 스타일(s 속성) 인덱스
+def _date_styles(archive):
+    if "xl/styles.xml" not in archive.namelist():
+        return set()
+    custom_formats, date_styles = {}, set()
+    in_cell_xfs, style_index = False, 0
+    with archive.open("xl/styles.xml") as f:
+        for event, elem in iterparse(f, events=("start", "end")):
+            if elem.tag == f"{MAIN_NS}numFmt" and event == "end":
+                code = FORMAT_LITERAL.sub("", elem.get("formatCode", ""))
+                custom_formats[int(elem.get("numFmtId"))] = bool(DATE_CODE.search(code))
+            elif elem.tag == f"{MAIN_NS}cellXfs":
+                in_cell_xfs = event == "start"
+            elif elem.tag == f"{MAIN_NS}xf" and in_cell_xfs and event == "end":
+                fmt = int(elem.get("numFmtId", 0))
+                if fmt in BUILTIN_DATE_FORMATS or custom_formats.get(fmt, False):
+                    date_styles.add(style_index)
+                style_index += 1
+    return date_styles
+
+
+# 필요한 공유 문자열만 {index: 문자열}로 로딩 - 마지막 필요 인덱스를 지나면 중단
+def _shared_strings(archive, wanted):
+    if not wanted or "xl/sharedStrings.xml" not in archive.namelist():
+        return {}
+    strings, last = {}, max(wanted)
+    for index, item in enumerate(_iter_elements(archive, "xl/sharedStrings.xml", f"{MAIN_NS}si")):
+        if index in wanted:
+            strings[index] = "".join(t.text or "" for t in item.iter(TEXT_TAG))
+        if index >= last:
+            break
+    return strings
+
+
+# 엑셀 날짜 serial → datetime (openpyxl과 같은 규칙: 밀리초 반올림, 1900 윤년 버그 보정)
+def _excel_datetime(serial):
+    day, fraction = divmod(serial, 1)
+    if 0 < serial < 60:
+        day += 1
+    return EXCEL_EPOCH + datetime.timedelta(days=day, milliseconds=round(fraction * 86400000))
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _text(value):
+    return None if value in NA_STRINGS else value
+
+
+def _cell_value(cell, strings, date_styles):
+    cell_type = cell.get("t")
+    if cell_type == "inlineStr":
+        return _text("".join(t.text or "" for t in cell.iter(TEXT_TAG)))
+    text = cell.findtext(VALUE_TAG)
+    if text is None or cell_type == "e":
+        return None
+    if cell_type == "s":
+        return _text(strings[int(text)])
+    if cell_type == "str":
+        return _text(text)
+    if cell_type == "b":
+        return text == "1"
+    if cell_type == "d":
+        return pd.Timestamp(text)
+    if int(cell.get("s", 0)) in date_styles:
+        return _excel_datetime(float(text))
+    return _number(text)
+
+
+# 시트 행 순회: 각 행을 (행 번호, {열 문자: cell})로 넘김 (행이 끝날 때마다 요소 정리)
+# 값이 없는 행은 xlsx에 <row>가 아예 없을 수 있으므로 행 번호(r 속성)로 빈 행 수를 계산
+def _iter_rows(archive, sheet_path):
+    number = 0
+    for row in _iter_elements(archive, sheet_path, ROW_TAG):
+        number = int(row.get("r", number + 1))
+        yield number, {CELL_COLUMN.match(cell.get("r")).group(0): cell for cell in row.iter(CELL_TAG)}
+
+
+def _has_value(cell):
+    return cell.find(VALUE_TAG) is not None or any(t.text for t in cell.iter(TEXT_TAG))
+
+
+# 빈 셀(None)은 NaN으로 - read_excel과 같은 dtype 추론
+def _chunk_frame(data, selected):
+    return pd.DataFrame({selected[col]: column for col, column in data.items()}).fillna(np.nan).infer_objects()
+
+
+# 빈 셀이 섞인 True/False 열은 read_excel처럼 float (1.0 / 0.0 / NaN)
+def _missing_bools_as_float(df):
+    for col in df.columns[df.dtypes == object]:
+        if df[col].isna().any() and pd.api.types.infer_dtype(df[col], skipna=True) == "boolean":
+            df[col] = df[col].astype(float)
+    return df
+
+
+# 시트를 스트리밍으로 읽어 chunksize 행씩 DataFrame으로 넘김 (첫 행 = 헤더)
+# - columns: 필요한 헤더만 지정하면 나머지 열은 값 변환/보관을 하지 않음
+# - 공유 문자열은 선택한 열이 참조하는 것만 로딩 (openpyxl read-only 모드는 전부 메모리에 올림)
+def iter_xlsx_chunks(path, sheet=None, columns=None, chunksize=10000):
+    with zipfile.ZipFile(path) as archive:
+        paths = _sheet_paths(archive)
+        sheet_path = paths[sheet] if sheet is not None else next(iter(paths.values()))
+        date_styles = _date_styles(archive)
+
+        header_number, header = next(_iter_rows(archive, sheet_path), (0, {}))
+        header_strings = _shared_strings(
+            archive, {int(cell.findtext(VALUE_TAG)) for cell in header.values() if cell.get("t") == "s"}
+        )
+        names = {col: _cell_value(cell, header_strings, date_styles) for col, cell in header.items()}
+        selected = {
+            col: str(name) for col, name in names.items()
+            if name is not None and (columns is None or name in columns)
+        }
+        if columns is not None:
+            missing = set(columns) - set(selected.values())
+            if missing:
+                raise ValueError(f"columns not found in {path}: {sorted(missing)}")
+
+        # 1) 선택한 열이 쓰는 공유 문자열 인덱스 수집 → 2) 해당 문자열만 로딩
+        wanted = set()
+        for i, (_, row) in enumerate(_iter_rows(archive, sheet_path)):
+            if i == 0:
+                continue
+            wanted.update(
+                int(cell.findtext(VALUE_TAG)) for col, cell in row.items()
+                if col in selected and cell.get("t") == "s"
+            )
+        strings = _shared_strings(archive, wanted)
+
+        # 3) 값 변환 후 chunk 단위로 DataFrame 생성
+        # read_excel과 동일: 중간의 빈 행은 NaN 행으로 유지, 마지막 값 있는 행 뒤의 빈 행은 버림
+        data = {col: [] for col in selected}
+        n_rows, emitted, last = 0, False, header_number
+        for i, (number, row) in enumerate(_iter_rows(archive, sheet_path)):
+            if i == 0 or not any(_has_value(cell) for cell in row.values()):
+                continue
+            values = {col: _cell_value(row[col], strings, date_styles) for col in selected if col in row}
+            for row_values in [{}] * (number - last - 1) + [values]:
+                for col, column in data.items():
+                    column.append(row_values.get(col))
+                n_rows += 1
+                if n_rows == chunksize:
+                    yield _chunk_frame(data, selected)
+                    data = {col: [] for col in selected}
+                    n_rows, emitted = 0, True
+            last = number
+        if n_rows or not emitted:
+            yield _chunk_frame(data, selected)
+
+
+# 시트 전체를 하나의 DataFrame으로 (ingest.read_export 기본 reader)
+def read_xlsx(path, sheet=None, columns=None, chunksize=10000):
+    chunks = list(iter_xlsx_chunks(path, sheet, columns, chunksize))
+    if len(chunks) == 1:
+        return _missing_bools_as_float(chunks[0])
+    return _missing_bools_as_float(pd.concat(chunks, ignore_index=True).infer_objects())